@@ -2,7 +2,7 @@ import sys
 import sqlite3
 import requests
 from bs4 import BeautifulSoup
-from .config import DB_PATH, TABLE_NAME
+from .config import DB_PATH, DB_PATH_STR, TABLE_NAME
 
 #DB_PATH = "courses_metcs.sqlite"
 TABLE_SQL = """
@@ -72,7 +72,7 @@ def scrape(url):
     print(f"[INFO] Found {len(all_rows)} rows")
     save_sqlite(all_rows)
 
-def save_sqlite(rows, db_path=DB_PATH):
+def save_sqlite(rows, db_path=DB_PATH_STR):
     con = sqlite3.connect(db_path)
     cur = con.cursor()
     # recreate table fresh each run
@@ -8,6 +8,7 @@ from . import chatalogue
 from . import bu_scraper
 from .db_interface import process_semantic_query
 from . import run_query as connections
+from .intent_classifier import get_intent_classifier
 
 
 import os
@@ -15,11 +16,28 @@ import tkinter as tk
 from tkinter import messagebox, filedialog, ttk, simpledialog
 import tkinter.font as tkfont
 from datetime import datetime
+from functools import lru_cache
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import time
 import sys
 import traceback
 
+import numpy as np
+
+# Optional accelerators for gradient images; without them we fall back to
+# drawing gradients as a stack of canvas rectangles.
+try:
+    from PIL import Image, ImageTk
+except ImportError:
+    Image = ImageTk = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Legacy imports (now handled in __init__.py)
 #import chatalogue as chatalogue
 #import bu_scraper as bu_scraper
@@ -27,44 +45,149 @@ import traceback
 
 # ---------- Utilities ----------
 
+# Scraper database location, resolved once
+_SCRAPER_DB_STR = getattr(bu_scraper, 'DB_PATH_STR', None)
+
+# Inputs answered on the UI thread without the NLP / DB / LLM pipeline
+_TRIVIAL = frozenset({"reset", "context", "clear", "hi", "hello", "hey", "bye", "quit", "exit"})
+_CONTEXT_COMMANDS = frozenset({"reset", "context", "clear"})
+_GREETINGS = frozenset({"hi", "hello", "hey"})
+
+# Font families are looked up once per process; tkfont.families() is costly
+_PREFERRED_FAMILIES = ["Poppins", "Inter", "Nunito Sans", "Segoe UI", "Helvetica"]
+_PREF_FAMILY: str | None = None
+
+def _resolve_font(root):
+    global _PREF_FAMILY
+    if _PREF_FAMILY is None:
+        avail = set(tkfont.families(root))
+        _PREF_FAMILY = next((f for f in _PREFERRED_FAMILIES if f in avail), "Segoe UI")
+    return _PREF_FAMILY
+
+_WELCOME_TEXT = " Welcome to Chatalogue, your campus companion! Ask me about courses, campus life, or support."
+
+@lru_cache(maxsize=1)
+def _ts_for(minute):
+    return datetime.fromtimestamp(minute * 60).strftime("%I:%M %p")
+
 def now_ts():
-    return datetime.now().strftime("%I:%M %p")
+    # The label only shows minutes, so format once per minute
+    return _ts_for(int(time.time()) // 60)
 
 def hex_to_rgb(h):
-    h = h.lstrip('#')
-    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+    # Single integer parse instead of three string slices
+    v = int(h.lstrip('#'), 16)
+    return (v >> 16) & 0xff, (v >> 8) & 0xff, v & 0xff
 
 def rgb_to_hex(rgb):
-    return '#%02x%02x%02x' % rgb
+    return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
 
 def blend(c1, c2, t):
     return tuple(int(c1[i] + (c2[i] - c1[i]) * t) for i in range(3))
 
-def draw_gradient_rect(canvas, x1, y1, x2, y2, color1, color2, steps=24, horizontal=False):
+# Batch versions of the helpers above, for computing many colours at once
+def hex_to_rgb_batch(colors):
+    hexes = ''.join(c.lstrip('#') for c in colors)
+    return np.frombuffer(bytes.fromhex(hexes), dtype=np.uint8).reshape(-1, 3)
+
+def rgb_to_hex_batch(rgb):
+    rgb = np.asarray(rgb, dtype=np.uint32).reshape(-1, 3)
+    packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    return np.char.mod('#%06x', packed).tolist()
+
+def blend_batch(c1, c2, t):
+    # c1/c2: (3,) or (N,3) colours, t: (N,) -> (N,3) uint8, same truncation as blend()
+    c1 = np.asarray(c1, dtype=np.float64)
+    c2 = np.asarray(c2, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)[:, None]
+    return (c1 + (c2 - c1) * t).astype(np.uint8)
+
+# Text fade-in colours (light grey -> near black), computed once
+_FADE_STEPS = 6
+_FADE_COLORS = tuple(rgb_to_hex_batch(
+    blend_batch((200, 200, 200), (17, 17, 17), np.arange(_FADE_STEPS + 1) / _FADE_STEPS)))
+
+def _gradient_row_u8(r1, g1, b1, r2, g2, b2, n):
+    # Pure numeric helper (no Tk objects) so it can be JIT-compiled by numba
+    out = np.empty((n, 3), dtype=np.uint8)
+    denom = max(1, n - 1)
+    for i in range(n):
+        t = i / denom
+        out[i, 0] = int(r1 + (r2 - r1) * t)
+        out[i, 1] = int(g1 + (g2 - g1) * t)
+        out[i, 2] = int(b1 + (b2 - b1) * t)
+    return out
+
+def _gradient_row_np(r1, g1, b1, r2, g2, b2, n):
+    t = np.linspace(0.0, 1.0, n)[:, None]
+    c1 = np.array((r1, g1, b1), dtype=np.float64)
+    c2 = np.array((r2, g2, b2), dtype=np.float64)
+    return (c1 + (c2 - c1) * t).astype(np.uint8)
+
+if njit is not None:
+    _gradient_row_u8 = njit(cache=True)(_gradient_row_u8)
+else:
+    _gradient_row_u8 = _gradient_row_np
+
+_GRADIENT_IMG_CACHE = {}
+_GRADIENT_IMG_CACHE_MAX = 64
+
+def _gradient_photo(canvas, w, h, color1, color2, horizontal):
+    """Return a cached PhotoImage holding a smooth w x h gradient."""
+    key = (canvas.tk, w, h, color1, color2, horizontal)
+    img = _GRADIENT_IMG_CACHE.get(key)
+    if img is not None:
+        return img
+    n = w if horizontal else h
+    row = _gradient_row_u8(*hex_to_rgb(color1), *hex_to_rgb(color2), n)
+    size = (n, 1) if horizontal else (1, n)
+    pil = Image.frombytes('RGB', size, row.tobytes()).resize((w, h), Image.NEAREST)
+    img = ImageTk.PhotoImage(pil, master=canvas)
+    if len(_GRADIENT_IMG_CACHE) >= _GRADIENT_IMG_CACHE_MAX:
+        _GRADIENT_IMG_CACHE.pop(next(iter(_GRADIENT_IMG_CACHE)))
+    _GRADIENT_IMG_CACHE[key] = img
+    return img
+
+def _draw_gradient_image(canvas, x1, y1, x2, y2, color1, color2, horizontal, tags=None):
+    if Image is None:
+        return False
+    try:
+        w = max(1, int(x2 - x1))
+        h = max(1, int(y2 - y1))
+        img = _gradient_photo(canvas, w, h, color1, color2, horizontal)
+        canvas.create_image(int(x1), int(y1), image=img, anchor='nw', tags=tags)
+        # Each canvas shows one gradient; keep it alive past cache eviction
+        canvas._gradient_img = img
+        return True
+    except Exception:
+        return False
+
+def draw_gradient_rect(canvas, x1, y1, x2, y2, color1, color2, steps=24, horizontal=False, tags=None):
+    if _draw_gradient_image(canvas, x1, y1, x2, y2, color1, color2, horizontal, tags):
+        return
     r1 = hex_to_rgb(color1); r2 = hex_to_rgb(color2)
+    colors = rgb_to_hex_batch(blend_batch(r1, r2, np.arange(steps) / steps))
     if horizontal:
         width = max(1, x2 - x1)
-        for i in range(steps):
+        for i, cstart in enumerate(colors):
             t1 = i / steps
             t2 = (i + 1) / steps
-            cstart = rgb_to_hex(blend(r1, r2, t1))
             xs = int(x1 + t1 * width)
             xe = int(x1 + t2 * width)
-            canvas.create_rectangle(xs, y1, xe, y2, outline="", fill=cstart)
+            canvas.create_rectangle(xs, y1, xe, y2, outline="", fill=cstart, tags=tags)
     else:
         height = max(1, y2 - y1)
-        for i in range(steps):
+        for i, cstart in enumerate(colors):
             t1 = i / steps
             t2 = (i + 1) / steps
-            cstart = rgb_to_hex(blend(r1, r2, t1))
             ys = int(y1 + t1 * height)
             ye = int(y1 + t2 * height)
-            canvas.create_rectangle(x1, ys, x2, ye, outline="", fill=cstart)
+            canvas.create_rectangle(x1, ys, x2, ye, outline="", fill=cstart, tags=tags)
 
 # ---------- Custom Widgets ----------
 
 class ChatBubble(tk.Frame):
-    def __init__(self, master, text, sender='bot', ts=None, max_width_pct=0.65, *args, **kwargs):
+    def __init__(self, master, text, sender='bot', ts=None, max_width_pct=0.65, skip_fade=False, *args, **kwargs):
         super().__init__(master, bg=master["bg"], pady=4)
         self.master = master
         self.text = text
@@ -77,11 +200,11 @@ class ChatBubble(tk.Frame):
         self.text_dark = "#111111"
         self.ts_color = "#666666"
 
-        preferred = ["Poppins", "Inter", "Nunito Sans", "Segoe UI", "Helvetica"]
-        avail = set(tkfont.families())
-        fam = next((f for f in preferred if f in avail), "Segoe UI")
-        self.body_font = tkfont.Font(family=fam, size=13)
-        self.ts_font = tkfont.Font(family=fam, size=9)
+        fam = _resolve_font(self)
+        self.body_font = tkfont.Font(root=self, family=fam, size=13)
+        self.ts_font = tkfont.Font(root=self, family=fam, size=9)
+        # Resolved once here; actual() is a Tcl round-trip we don't want on every hover
+        self._body_family = self.body_font.actual('family')
 
         self.canvas = tk.Canvas(self, bg=self.master["bg"], highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
@@ -89,11 +212,21 @@ class ChatBubble(tk.Frame):
         self._rx1 = self._rx2 = self._ry1 = self._ry2 = 0
         self._rendered = False
         self._copy_tag = f"copy_{id(self)}"
+        self._grad_tag = f"grad_{id(self)}"
+        self._gradient_drawn = False
         self._hovering = False
         self._hover_job = None
-        self._skip_fade = False
-
-        self.after(10, self._render)
+        self._skip_fade = skip_fade
+        self._parent_width = None
+
+        # Render right away when the layout is already known (or we're in a batch);
+        # only defer while the window hasn't been mapped yet. master is the wrapper
+        # frame created alongside this bubble and isn't laid out yet, so ask the
+        # toplevel, whose width _render uses anyway
+        if skip_fade or self.winfo_toplevel().winfo_width() > 1:
+            self._render()
+        else:
+            self.after(10, self._render)
 
     def copy_to_clipboard(self, event=None):
         try:
@@ -112,8 +245,9 @@ class ChatBubble(tk.Frame):
             return
         self._rendered = True
 
+        # Prefer the width handed down by the app; only ask Tk if unknown
         try:
-            root_w = self.winfo_toplevel().winfo_width() or 1000
+            root_w = self._parent_width or self.winfo_toplevel().winfo_width() or 1000
         except Exception:
             root_w = 1000
 
@@ -123,7 +257,20 @@ class ChatBubble(tk.Frame):
 
         icon = "🧑" if self.sender == 'user' else "🤖"
         display = f"{icon}  {self.text}"
-        
+
+        if self.sender == 'user':
+            c1, c2 = self.user_c1, self.user_c2
+        else:
+            c1, c2 = self.bot_c1, self.bot_c2
+
+        # Z-order is creation order: background first (sized once the text is
+        # measured), then body and timestamp text on top, so no tag_raise is needed.
+        # Solid midpoint fill + border as one item; the gradient is painted on first hover
+        self._c1, self._c2 = c1, c2
+        self._gradient_drawn = False
+        mid = rgb_to_hex(blend(hex_to_rgb(c1), hex_to_rgb(c2), 0.5))
+        self._bg_id = self.canvas.create_rectangle(0, 0, 0, 0, fill=mid, outline="#E0E0E0", width=1)
+
         # Create text element; keep reference for resize updates
         if getattr(self, 'text_id', None):
             try:
@@ -132,7 +279,7 @@ class ChatBubble(tk.Frame):
                 pass
         self.text_id = self.canvas.create_text(16, 12, text=display, font=self.body_font,
                                                fill=self.text_dark, width=wrap_w, anchor='nw', justify='left')
-        self.canvas.update_idletasks()
+        # Text item bboxes are computed when the item is created; no idle flush needed
         bbox = self.canvas.bbox(self.text_id) or (0,0,200,20)
         x1, y1, x2, y2 = bbox
         pad_x, pad_y = 14, 10
@@ -145,28 +292,13 @@ class ChatBubble(tk.Frame):
 
         canvas_w = rx2 + pad_x + 8
         canvas_h = ry2 + pad_y + 8
-        try:
-            total_w = self.winfo_toplevel().winfo_width() or root_w
-        except:
-            total_w = root_w
-        desired_w = int(total_w * self.max_width_pct)
+        desired_w = int(root_w * self.max_width_pct)
         if desired_w < canvas_w:
             canvas_w = desired_w
         self.canvas.config(width=canvas_w, height=canvas_h)
 
         self._rx1, self._rx2, self._ry1, self._ry2 = rx1, rx2, ry1, ry2
-
-        if self.sender == 'user':
-            c1, c2 = self.user_c1, self.user_c2
-            text_color = self.text_dark
-        else:
-            c1, c2 = self.bot_c1, self.bot_c2
-            text_color = self.text_dark
-
-        # Draw background gradient (reduced steps for performance)
-        draw_gradient_rect(self.canvas, rx1, ry1, rx2, ry2, c1, c2, steps=8, horizontal=False)
-        self.canvas.create_rectangle(rx1+1, ry1+1, rx2-1, ry2-1, outline="#E0E0E0", width=1)
-        self.canvas.tag_raise(self.text_id)
+        self.canvas.coords(self._bg_id, rx1+1, ry1+1, rx2-1, ry2-1)
 
         ts_x = rx2 - pad_x - 4 if self.sender == 'user' else rx1 + pad_x + 4
         ts_anchor = 'se' if self.sender == 'user' else 'sw'
@@ -182,9 +314,10 @@ class ChatBubble(tk.Frame):
             self._fade_in_text(self.text_id)
         self._skip_fade = False
 
-    def refresh(self):
+    def refresh(self, parent_width=None):
         """Force re-render of the bubble. Useful on window resize."""
         try:
+            self._parent_width = parent_width
             for it in self.canvas.find_all():
                 try:
                     self.canvas.delete(it)
@@ -205,8 +338,21 @@ class ChatBubble(tk.Frame):
         nb = clamp(b + (255 - b) * amount)
         return rgb_to_hex((nr,ng,nb))
 
+    def _draw_hover_gradient(self):
+        # Slide the gradient under the (now transparent) background so the border stays on top
+        draw_gradient_rect(self.canvas, self._rx1, self._ry1, self._rx2, self._ry2,
+                           self._c1, self._c2, steps=8, horizontal=False, tags=(self._grad_tag,))
+        self.canvas.tag_lower(self._grad_tag, self._bg_id)
+        self.canvas.itemconfigure(self._bg_id, fill="")
+        self._gradient_drawn = True
+
     def _on_enter(self, ev):
         self._hovering = True
+        try:
+            if self._rendered and not self._gradient_drawn:
+                self._draw_hover_gradient()
+        except Exception:
+            pass
         try:
             if not self.canvas.find_withtag(self._copy_tag):
                 bx2 = int(self._rx2 - 10)
@@ -217,7 +363,7 @@ class ChatBubble(tk.Frame):
                 fill = self._lighter(base_fill, 0.72)
                 self.canvas.create_rectangle(bx1, by1, bx2, by2, outline="#2C2828", fill=fill, tags=(self._copy_tag,))
                 self.canvas.create_text((bx1+bx2)//2, (by1+by2)//2, text="Copy", fill="#111111",
-                                        font=(self.body_font.actual('family'), 9), tags=(self._copy_tag,))
+                                        font=(self._body_family, 9), tags=(self._copy_tag,))
                 self.canvas.tag_bind(self._copy_tag, "<Button-1>", self.copy_to_clipboard)
         except Exception:
             pass
@@ -248,14 +394,10 @@ class ChatBubble(tk.Frame):
         step()
 
     def _fade_in_text(self, text_id):
-        steps = 6
         def tick(i):
-            if i > steps:
+            if i > _FADE_STEPS:
                 return
-            start = 200
-            end = 17
-            val = int(start + (end - start) * (i / steps))
-            hexc = rgb_to_hex((val, val, val))
+            hexc = _FADE_COLORS[i]
             try:
                 for it in self.canvas.find_all():
                     if self.canvas.type(it) == "text":
@@ -268,7 +410,7 @@ class ChatBubble(tk.Frame):
 # ---------- Main Application ----------
 
 class ChatApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, warm_models=True):
         super().__init__()
         self.title("Chatalogue — Your Smart Campus Assistant")
         
@@ -299,6 +441,21 @@ class ChatApp(tk.Tk):
         self._last_inner_w = None
         self._chat_config_job = None
         self._jump_check_job = None
+        self._batching = False
+        self._cached_scroll_bbox = None
+        self._scroll_pending = False
+
+        # Backend calls run off the Tk thread so the event loop never blocks:
+        # chat turns go through one long-lived worker (in order, warm state),
+        # scraping and file saves through the executor
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        if warm_models:
+            # Load + warm the intent model while the window is coming up; a daemon
+            # thread, so closing the window doesn't wait for the load to finish
+            threading.Thread(target=get_intent_classifier, daemon=True).start()
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
 
         # Main Scrollable Area
         main_wrap = tk.Frame(self, bg="#2C2C2C")
@@ -315,14 +472,15 @@ class ChatApp(tk.Tk):
         self.chat_frame = tk.Frame(self.chat_canvas, bg="#252626")
         self.chat_window_id = self.chat_canvas.create_window((0,0), window=self.chat_frame, anchor='nw')
         self.chat_canvas.pack(fill=tk.BOTH, expand=True, side=tk.LEFT, padx=12, pady=12)
-        self.chat_frame.bind("<Configure>", lambda e: self._on_chat_frame_configure())
+        self._bind_chat_frame_configure()
         self.global_scrollbar.config(command=self.chat_canvas.yview)
 
         # Bindings
         self.bind("<Configure>", lambda e: self._on_resize())
-        self.bind_all("<MouseWheel>", self._on_mousewheel)
-        self.bind_all("<Button-4>", self._on_mousewheel)
-        self.bind_all("<Button-5>", self._on_mousewheel)
+        # Wheel events are dispatched once from this window's bindtag rather than
+        # via bind_all, so tooltips and dialogs don't route through the handler
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.bind(seq, self._on_mousewheel)
 
         # Input Area
         self.divider = tk.Frame(self, bg="#DDDDDD", height=1)
@@ -330,13 +488,30 @@ class ChatApp(tk.Tk):
 
         # Chat History
         self.history = []
-        self._welcome_text = " Welcome to Chatalogue, your campus companion! Ask me about courses, campus life, or support."
+        self._history_text_cache: str | None = None
+        self._history_dirty = True
+        self._welcome_text = _WELCOME_TEXT
         self.add_bot(self._welcome_text)
 
         # Focus input on load
         self.jump_visible = False
         self.after(200, lambda: self.user_input.focus_set())
 
+    def _bind_chat_frame_configure(self):
+        self.chat_frame.bind("<Configure>", lambda e: self._on_chat_frame_configure())
+
+    def begin_batch(self):
+        """Suspend layout updates while several messages are appended."""
+        self._batching = True
+        self.chat_frame.unbind("<Configure>")
+
+    def end_batch(self):
+        """Resume layout updates and apply them once for the whole batch."""
+        self._batching = False
+        self._bind_chat_frame_configure()
+        self._handle_chat_frame_configure()
+        self.chat_canvas.yview_moveto(1.0)
+
     def _on_chat_frame_configure(self):
         # Debounce configuration events to improve performance
         try:
@@ -352,7 +527,9 @@ class ChatApp(tk.Tk):
     def _handle_chat_frame_configure(self):
         # Update scroll region and adjust bubble widths
         try:
-            self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
+            # Only chat_frame layout changes move the scroll bbox, so cache it here
+            self._cached_scroll_bbox = self.chat_canvas.bbox("all")
+            self.chat_canvas.configure(scrollregion=self._cached_scroll_bbox)
             canvas_w = self.chat_canvas.winfo_width()
             inner_w = max(360, int(canvas_w * 0.90))
             self.chat_canvas.itemconfigure(self.chat_window_id, width=inner_w)
@@ -360,10 +537,12 @@ class ChatApp(tk.Tk):
             # Avoid expensive redraws for minor pixel changes
             threshold = 8
             if self._last_inner_w is None or abs(inner_w - self._last_inner_w) >= threshold:
+                # Query the window width once and hand it to every bubble
+                parent_width = self.winfo_width()
                 for wrapper in self.chat_frame.winfo_children():
                     for child in wrapper.winfo_children():
                         if isinstance(child, ChatBubble):
-                            child.refresh()
+                            child.refresh(parent_width)
                 self._last_inner_w = inner_w
         except Exception:
             pass
@@ -371,9 +550,7 @@ class ChatApp(tk.Tk):
             self._chat_config_job = None
 
     def _choose_font(self):
-        pref = ["Poppins", "Inter", "Nunito Sans", "Segoe UI", "Helvetica"]
-        avail = set(tkfont.families())
-        return next((f for f in pref if f in avail), "Segoe UI")
+        return _resolve_font(self)
 
     def _build_header_buttons(self):
         # Define titles
@@ -487,7 +664,7 @@ class ChatApp(tk.Tk):
         self.input_bg.bind("<Configure>", lambda e: self._draw_input_bg())
 
         # Font for input to calculate line height
-        self.input_font = tkfont.Font(family=self.pref_font, size=14)
+        self.input_font = tkfont.Font(root=self, family=self.pref_font, size=14)
         
         # Create the Text widget with proper styling
         self.user_input = tk.Text(self.input_area, height=2, wrap='word', font=self.input_font, 
@@ -646,7 +823,7 @@ class ChatApp(tk.Tk):
             y1, y2 = self.chat_canvas.yview()
             
             # Get total scrollable height in pixels
-            bbox = self.chat_canvas.bbox("all")
+            bbox = self._cached_scroll_bbox or self.chat_canvas.bbox("all")
             if not bbox:
                 return
             scroll_h = bbox[3]
@@ -706,21 +883,37 @@ class ChatApp(tk.Tk):
     def add_bot(self, text):
         ts = now_ts()
         self.history.append(f"Bot: {text}")
+        self._history_dirty = True
         wrapper = tk.Frame(self.chat_frame, bg="#252626")
         wrapper.pack(fill=tk.X, pady=4, anchor='w', padx=8)
-        bubble = ChatBubble(wrapper, text=text, sender='bot', ts=ts, max_width_pct=0.65)
+        bubble = ChatBubble(wrapper, text=text, sender='bot', ts=ts, max_width_pct=0.65,
+                            skip_fade=self._batching)
         bubble.pack(anchor='w', padx=(4, 40))
-        # Auto-scroll to bottom
-        self.after(50, lambda: self.chat_canvas.yview_moveto(1.0))
+        # Auto-scroll to bottom (deferred to end_batch while batching)
+        if not self._batching:
+            self._request_scroll()
 
     def add_user(self, text):
         ts = now_ts()
         self.history.append(f"You: {text}")
+        self._history_dirty = True
         wrapper = tk.Frame(self.chat_frame, bg="#252626")
         wrapper.pack(fill=tk.X, pady=4, anchor='e', padx=8)
-        bubble = ChatBubble(wrapper, text=text, sender='user', ts=ts, max_width_pct=0.65)
+        bubble = ChatBubble(wrapper, text=text, sender='user', ts=ts, max_width_pct=0.65,
+                            skip_fade=self._batching)
         bubble.pack(anchor='e', padx=(40, 4))
-        self.after(50, lambda: self.chat_canvas.yview_moveto(1.0))
+        if not self._batching:
+            self._request_scroll()
+
+    def _request_scroll(self):
+        # Coalesce: any number of appends before the next idle produce one scroll
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            self.after_idle(self._do_scroll)
+
+    def _do_scroll(self):
+        self._scroll_pending = False
+        self.chat_canvas.yview_moveto(1.0)
 
     def _on_enter(self, ev=None):
         if ev and (ev.state & 0x0001):
@@ -733,6 +926,8 @@ class ChatApp(tk.Tk):
         return "break"
 
     def on_send(self):
+        if str(self.send_btn["state"]) == tk.DISABLED:
+            return
         msg = self.user_input.get("1.0", "end").strip()
         if not msg:
             messagebox.showerror("Input Error", "Please enter a message before sending.")
@@ -740,30 +935,57 @@ class ChatApp(tk.Tk):
         self.add_user(msg)
         self.user_input.delete("1.0", "end")
 
+        low = msg.lower()
+        if low in _TRIVIAL:
+            self._handle_trivial(low)
+            return
+
         # Show typing indicator
         typing_wrap = tk.Frame(self.chat_frame, bg="#252626")
         typing_wrap.pack(fill=tk.X, pady=4, anchor='w', padx=8)
         typing_bubble = ChatBubble(typing_wrap, text="🤖  Chatalogue is typing...", sender='bot', ts=now_ts(), max_width_pct=0.65)
         typing_bubble.pack(anchor='w', padx=(4, 40))
 
-        stop_flag = {"stop": False}
-
-        def call_backend(m):
+        # One query in flight at a time; re-enabled in _on_query_result
+        self.send_btn.config(state=tk.DISABLED)
+        self._jobs.put((msg, typing_wrap))
+
+    def _handle_trivial(self, cmd):
+        """Reply to a command/greeting directly, without a worker round-trip."""
+        if cmd in _CONTEXT_COMMANDS:
+            # chat_loop handles these before any parsing, so it's cheap to call inline
+            reply = chatalogue.chat_loop(cmd)
+        elif cmd in _GREETINGS:
+            reply = "Hi there! Ask me about courses, instructors, schedules, or locations."
+        else:
+            reply = "Goodbye! Close the window whenever you're done, or ask another question."
+        self.add_bot(reply)
+
+    def _worker_loop(self):
+        """Persistent chat worker: runs chat_loop for each queued message."""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            msg, typing_wrap = job
             try:
-                reply = chatalogue.chat_loop(m)
+                reply = chatalogue.chat_loop(msg)
             except Exception:
                 tb = traceback.format_exc()
                 print("Backend exception:\n", tb)
                 reply = "⚠️ Backend error: an exception occurred. Check logs for details."
-            finally:
-                stop_flag["stop"] = True
-            
-            self.after(200, lambda: self._replace_typing(typing_wrap, reply))
-        t2 = threading.Thread(target=call_backend, args=(msg,), daemon=True)
-        t2.start()
+            try:
+                self.after(0, self._on_query_result, reply, typing_wrap)
+            except Exception:
+                return  # window already destroyed
+
+    def _on_query_result(self, reply, typing_wrapper):
+        """Runs on the Tk thread once the worker has a reply."""
+        self.send_btn.config(state=tk.NORMAL)
+        self._replace_typing(typing_wrapper, reply)
 
     def on_scrape(self):
-        """Handle scraping URL via background thread."""
+        """Handle scraping URL via the background executor."""
         try:
             default = "https://www.bu.edu/met/degrees-certificates/bs-computer-science/"
             url = simpledialog.askstring("Scrape URL", "Enter URL to scrape:", initialvalue=default)
@@ -780,26 +1002,34 @@ class ChatApp(tk.Tk):
                 delete_db = False
 
             def _run():
-                try:
-                    if delete_db:
-                        try:
-                            dbp = getattr(bu_scraper, 'DB_PATH', None)
-                            if dbp and os.path.exists(dbp):
-                                os.remove(dbp)
-                                print(f"[INFO] Removed existing DB: {dbp}")
-                        except Exception as e:
-                            print("[WARN] Failed to remove DB file:", e)
-                    bu_scraper.scrape(url)
-                    self.after(100, lambda: messagebox.showinfo("Scrape complete", f"Scraped and saved data from:\n{url}"))
-                except Exception as e:
-                    tb = traceback.format_exc()
-                    print("Scrape exception:\n", tb)
-                    self.after(100, lambda: messagebox.showerror("Scrape error", str(e)))
-
-            threading.Thread(target=_run, daemon=True).start()
+                if delete_db and _SCRAPER_DB_STR:
+                    try:
+                        os.remove(_SCRAPER_DB_STR)
+                        print(f"[INFO] Removed existing DB: {_SCRAPER_DB_STR}")
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        print("[WARN] Failed to remove DB file:", e)
+                bu_scraper.scrape(url)
+
+            self.scrape_btn.config(state=tk.DISABLED)
+            fut = self._executor.submit(_run)
+            fut.add_done_callback(lambda f: self.after(0, self._on_scrape_result, f, url))
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def _on_scrape_result(self, fut, url):
+        """Runs on the Tk thread once the scrape future has finished."""
+        self.scrape_btn.config(state=tk.NORMAL)
+        try:
+            fut.result()
+        except Exception as e:
+            tb = traceback.format_exc()
+            print("Scrape exception:\n", tb)
+            messagebox.showerror("Scrape error", str(e))
+            return
+        messagebox.showinfo("Scrape complete", f"Scraped and saved data from:\n{url}")
+
     def _replace_typing(self, typing_wrapper, text):
         try:
             typing_wrapper.destroy()
@@ -811,9 +1041,16 @@ class ChatApp(tk.Tk):
 
     # ---- Actions: Copy, Save, Clear ----
 
+    def _history_text(self):
+        """Joined transcript, re-built only after the history changes."""
+        if self._history_dirty or self._history_text_cache is None:
+            self._history_text_cache = "\n".join(self.history)
+            self._history_dirty = False
+        return self._history_text_cache
+
     def copy_all(self):
         try:
-            plain = "\n".join(self.history)
+            plain = self._history_text()
             self.clipboard_clear()
             self.clipboard_append(plain)
             messagebox.showinfo("Copied", "Conversation copied to clipboard ✅")
@@ -827,30 +1064,57 @@ class ChatApp(tk.Tk):
                                                  initialfile=default_name, title="Save Conversation As")
             if not fpath:
                 return
-            with open(fpath, "w", encoding="utf-8") as f:
-                for m in self.history:
-                    f.write(m + "\n")
-            messagebox.showinfo("Saved", f"Conversation saved to:\n{fpath}")
+            # Snapshot the transcript now; the write itself happens off the Tk thread
+            text = self._history_text()
+            fut = self._executor.submit(self._do_save, fpath, text)
+            fut.add_done_callback(lambda f: self.after(0, self._on_save_result, f, fpath))
+        except Exception as e:
+            messagebox.showerror("Save Error", str(e))
+
+    @staticmethod
+    def _do_save(fpath, text):
+        with open(fpath, "w", encoding="utf-8", buffering=1 << 16) as f:
+            f.write(text + "\n" if text else "")
+
+    def _on_save_result(self, fut, fpath):
+        try:
+            fut.result()
         except Exception as e:
             messagebox.showerror("Save Error", str(e))
+            return
+        messagebox.showinfo("Saved", f"Conversation saved to:\n{fpath}")
 
     def clear_chat(self):
         if not messagebox.askyesno("Clear Chat", "Are you sure you want to clear the chat?"):
             return
-        for w in self.chat_frame.winfo_children():
-            w.destroy()
-        self.history = []
-        self.add_bot(self._welcome_text)
+        # Hide the frame and hold layout updates so teardown + rebuild costs one redraw
+        self.begin_batch()
+        self.chat_canvas.itemconfigure(self.chat_window_id, state='hidden')
+        try:
+            for w in self.chat_frame.winfo_children():
+                w.destroy()
+            self.history = []
+            self._history_dirty = True
+            self.add_bot(self._welcome_text)
+        finally:
+            self.chat_canvas.itemconfigure(self.chat_window_id, state='normal')
+            self.end_batch()
+
+    def destroy(self):
+        # Don't let queued backend work keep the process alive after close
+        try:
+            self._jobs.put(None)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+        super().destroy()
 
 
 # ---------- Lifecycle Management ----------
 
 def _on_app_close(app, conn):
     try:
-        try:
-            messagebox.showinfo("Shutting down", "Disconnecting local database and closing the app...")
-        except Exception:
-            pass
+        print("[INFO] Shutting down: disconnecting local database and closing the app...")
 
         if conn is not None:
             try:
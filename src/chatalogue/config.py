@@ -5,6 +5,7 @@ PACKAGE_ROOT = Path(__file__).resolve().parent
 DATA_DIR = PACKAGE_ROOT.parent.parent / "data"
 
 DB_PATH = DATA_DIR / "courses_metcs.sqlite"
+DB_PATH_STR = str(DB_PATH)  # for os.path / os.remove callers
 TABLE_NAME = "public_classes"
 
 NER_PATH = PACKAGE_ROOT.parent.parent / "models" / "ner" / "course_ner_model"
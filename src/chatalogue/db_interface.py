@@ -5,6 +5,7 @@
 # ============================================================
 
 from __future__ import annotations
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 import re
 import sys
@@ -36,6 +37,23 @@ WEEKDAY_TO_DB_FORMAT: Dict[str, str] = {
     "SUN": "SU", "SUNDAY": "SU",
 }
 
+@lru_cache(maxsize=1024)
+def _like_wrap(value: str) -> str:
+    """'%value%' pattern; cached so repeated WHERE values share one string."""
+    return f"%{value}%"
+
+
+# Ready-made LIKE patterns for the names above ("MON" -> "%m%")
+_WEEKDAY_LIKE: Dict[str, str] = {
+    name: _like_wrap(code.lower()) for name, code in WEEKDAY_TO_DB_FORMAT.items()
+}
+
+# Characters dropped when normalizing course codes ("CS-111" -> "cs111")
+_COURSE_CODE_STRIP = str.maketrans("", "", " -")
+
+# Trailing section token in a course code ("CS 350 A1" -> "A1")
+_SECTION_RE = re.compile(r"[A-Z]\d{1,2}")
+
 COURSE_INTENTS = {
     "course_info",
     "instructor_lookup",
@@ -75,62 +93,70 @@ def build_query_params(
     # Determine SELECT columns
     select_cols = _get_select_columns(requested_attributes)
     
-    # Build WHERE conditions
-    where_conditions = []
-    
     # Course code (may include section)
-    section_filter = None
+    norm = section_filter = None
     if course_code:
-        parts = course_code.strip().split()
+        code = course_code.strip()
         
         # Check if last part is section (A1, B3, etc.)
-        if len(parts) >= 2 and re.match(r"^[A-Z]\d{1,2}$", parts[-1]):
-            section_filter = parts[-1]
-            course_code_without_section = " ".join(parts[:-1])
-            norm = _normalize_course_code(course_code_without_section)
-        else:
-            norm = _normalize_course_code(course_code)
-        
-        where_conditions.append({
+        head, _, last = code.rpartition(" ")
+        if head and _SECTION_RE.fullmatch(last):
+            section_filter = last
+            code = head
+        norm = _normalize_course_code(code)
+    
+    # Weekday LIKE patterns (AND logic)
+    day_patterns = []
+    for w in weekdays or ():
+        w_upper = (w or "").strip().upper()
+        if not w_upper:
+            continue
+        pattern = _WEEKDAY_LIKE.get(w_upper)
+        if pattern is None:
+            pattern = _like_wrap(w_upper.lower())
+        day_patterns.append(pattern)
+    
+    # Build WHERE conditions into a list sized up front
+    n = (norm is not None) + bool(section_filter) + bool(instructor_name) + len(day_patterns)
+    where_conditions: List[Any] = [None] * n
+    i = 0
+    
+    if norm is not None:
+        where_conditions[i] = {
             "column": "course_number",
             "operator": "LIKE",
-            "value": f"%{norm}%",
+            "value": _like_wrap(norm),
             "case_insensitive": True
-        })
+        }
+        i += 1
         
         if section_filter:
-            where_conditions.append({
+            where_conditions[i] = {
                 "column": "section",
                 "operator": "=",
                 "value": section_filter
-            })
+            }
+            i += 1
     
     # Instructor
     if instructor_name:
-        where_conditions.append({
+        where_conditions[i] = {
             "column": "instructor",
             "operator": "LIKE",
-            "value": f"%{instructor_name.strip().lower()}%",
+            "value": _like_wrap(instructor_name.strip().lower()),
             "case_insensitive": True
-        })
-    
-    # Weekdays (AND logic)
-    if weekdays:
-        db_days = []
-        for w in weekdays:
-            w_upper = (w or "").strip().upper()
-            if not w_upper:
-                continue
-            db_day = WEEKDAY_TO_DB_FORMAT.get(w_upper, w_upper)
-            db_days.append(db_day)
-        
-        for db_day in db_days:
-            where_conditions.append({
-                "column": "days",
-                "operator": "LIKE",
-                "value": f"%{db_day.lower()}%",
-                "case_insensitive": True
-            })
+        }
+        i += 1
+    
+    # Weekdays
+    for pattern in day_patterns:
+        where_conditions[i] = {
+            "column": "days",
+            "operator": "LIKE",
+            "value": pattern,
+            "case_insensitive": True
+        }
+        i += 1
     
     return {
         "select_columns": select_cols,
@@ -155,22 +181,16 @@ def build_sql_string(query_params: Dict[str, Any]) -> tuple[str, List[Any]]:
     order_by = query_params.get("order_by", [])
     
     # Build SELECT
-    sql = "SELECT " + ", ".join(select_cols) + " FROM public_classes"
+    sql = _select_clause(tuple(select_cols))
     
     # Build WHERE
     params = []
     if where_conditions:
         where_clauses = []
         for cond in where_conditions:
-            column = cond["column"]
-            operator = cond["operator"]
-            case_insensitive = cond.get("case_insensitive", False)
-            
-            if case_insensitive:
-                where_clauses.append(f"REPLACE(LOWER({column}), ' ', '') {operator} ?")
-            else:
-                where_clauses.append(f"{column} {operator} ?")
-            
+            where_clauses.append(_where_clause(
+                cond["column"], cond["operator"], cond.get("case_insensitive", False)
+            ))
             params.append(cond["value"])
         
         sql += " WHERE " + " AND ".join(where_clauses)
@@ -182,46 +202,68 @@ def build_sql_string(query_params: Dict[str, Any]) -> tuple[str, List[Any]]:
     return sql, params
 
 
+# The same few column sets / conditions recur across queries, so their SQL
+# fragments are formatted once and reused.
+
+@lru_cache(maxsize=256)
+def _select_clause(select_cols: tuple) -> str:
+    return "SELECT " + ", ".join(select_cols) + " FROM public_classes"
+
+
+@lru_cache(maxsize=256)
+def _where_clause(column: str, operator: str, case_insensitive: bool) -> str:
+    if case_insensitive:
+        return f"REPLACE(LOWER({column}), ' ', '') {operator} ?"
+    return f"{column} {operator} ?"
+
+
 # ------------------------------------------------------------
 # HELPER FUNCTIONS
 # ------------------------------------------------------------
 
-def _get_select_columns(attrs: List[str]) -> List[str]:
-    """Map semantic_parse attributes to DB columns."""
-    if not attrs:
-        attrs = ["all"]
-    
+_BASE_SELECT_COLUMNS: List[str] = ["course_number", "course_name", "section",
+        "instructor", "location", "days", "times"]
+
+
+def _columns_for(attr_keys: List[str]) -> tuple:
+    """Columns for a set of COURSE_ATTR_TO_COLS keys (base columns first)."""
     # Always include these base columns
-    cols: List[str] = ["course_number", "course_name", "section",
-            "instructor", "location", "days", "times"]
-    
-    for attr in attrs:
-        key = (attr or "").lower()
-        mapped = COURSE_ATTR_TO_COLS.get(key)
-        if not mapped:
-            mapped = COURSE_ATTR_TO_COLS["all"]
-        for c in mapped:
+    cols: List[str] = list(_BASE_SELECT_COLUMNS)
+    for key in attr_keys:
+        for c in COURSE_ATTR_TO_COLS[key]:
             if c not in cols:
                 cols.append(c)
-    
-    # Deduplicate
-    seen = set()
-    deduped: List[str] = []
-    for c in cols:
-        if c not in seen:
-            deduped.append(c)
-            seen.add(c)
-    return deduped
+    return tuple(cols)
+
+
+# Each attribute gets a bit; every combination's column tuple is built once
+_ATTR_BIT: Dict[str, int] = {key: 1 << i for i, key in enumerate(COURSE_ATTR_TO_COLS)}
+_MASK_TO_COLS: Dict[int, tuple] = {
+    mask: _columns_for([k for k, bit in _ATTR_BIT.items() if mask & bit])
+    for mask in range(1 << len(_ATTR_BIT))
+}
+
+
+def _get_select_columns(attrs: List[str]) -> tuple:
+    """Map semantic_parse attributes to DB columns.
+
+    Returns a shared tuple from _MASK_TO_COLS; callers must not mutate it.
+    """
+    all_bit = _ATTR_BIT["all"]
+    mask = 0
+    for attr in attrs or ("all",):
+        # Unknown attributes fall back to "all"
+        mask |= _ATTR_BIT.get((attr or "").lower(), all_bit)
+    return _MASK_TO_COLS[mask]
 
 
+@lru_cache(maxsize=1024)
 def _normalize_course_code(raw: str) -> str:
-    """Normalize course code for fuzzy matching."""
+    """Normalize course code for fuzzy matching (memoized; codes recur across queries)."""
     if not raw:
         return ""
-    raw = raw.strip()
-    raw = raw.replace("-", "")  # Remove hyphens
-    raw = raw.replace(" ", "")   # Remove all spaces
-    return raw.lower()
+    # Single pass: drop hyphens and spaces, then lowercase
+    return raw.strip().translate(_COURSE_CODE_STRIP).lower()
 
 
 # ------------------------------------------------------------
@@ -306,59 +348,68 @@ def process_semantic_query(semantic_parse: Dict[str, Any], fuzzy_results: Option
         if not course_codes:
             course_codes = [None]
         
+        subquery_text = subq.get("text", "")
+        weekdays_key = tuple(weekdays)
+        attrs_key = tuple(requested_attrs)
+        always_query = intent in COURSE_INTENTS or intent == "instructor_lookup"
+        chitchat_like = intent in ("chitchat", "unknown")
+        
         # FIXED: Generate query for EACH combination of course and instructor
         for course_code in course_codes:
             for instructor_name in instructor_names:
                 # Override chitchat if entities present
-                should_query = False
-                
-                if intent in COURSE_INTENTS or intent == "instructor_lookup":
-                    should_query = True
-                elif intent in ["chitchat", "unknown"]:
-                    if instructor_name or course_code or weekdays:
-                        should_query = True
+                should_query = always_query or (
+                    chitchat_like and bool(instructor_name or course_code or weekdays)
+                )
                 
+                query_params = sql_string = sql_params = None
                 if should_query:
-                    # Build query params
-                    query_params = build_query_params(
-                        course_code=course_code,
-                        instructor_name=instructor_name,
-                        weekdays=weekdays,
-                        requested_attributes=requested_attrs
+                    # Build query params + SQL (cached per entity signature)
+                    query_params, sql_string, sql_params = _compile_sql(
+                        course_code, instructor_name, weekdays_key, attrs_key
                     )
-                    
-                    # Generate SQL string
-                    sql_string, sql_params = build_sql_string(query_params)
-                    
-                    results.append({
-                        "index": len(results),
-                        "intent": intent,
-                        "subquery_text": subq.get("text", ""),
-                        "requested_attributes": requested_attrs,
-                        "course_code_used": course_code,
-                        "instructor_used": instructor_name,
-                        "weekdays_used": weekdays,
-                        "query_params": query_params,
-                        "sql_string": sql_string,
-                        "sql_params": sql_params
-                    })
-                else:
-                    results.append({
-                        "index": len(results),
-                        "intent": intent,
-                        "subquery_text": subq.get("text", ""),
-                        "requested_attributes": requested_attrs,
-                        "course_code_used": course_code,
-                        "instructor_used": instructor_name,
-                        "weekdays_used": weekdays,
-                        "query_params": None,
-                        "sql_string": None,
-                        "sql_params": None
-                    })
+                    sql_params = list(sql_params)
+                
+                # Plain dicts: this payload goes to the DB service as JSON
+                results.append({
+                    "index": len(results),
+                    "intent": intent,
+                    "subquery_text": subquery_text,
+                    "requested_attributes": requested_attrs,
+                    "course_code_used": course_code,
+                    "instructor_used": instructor_name,
+                    "weekdays_used": weekdays,
+                    "query_params": query_params,
+                    "sql_string": sql_string,
+                    "sql_params": sql_params
+                })
     
     return {"subqueries": results}
 
 
+@lru_cache(maxsize=2048)
+def _compile_sql(
+    course_code: Optional[str],
+    instructor_name: Optional[str],
+    weekdays: tuple,
+    requested_attributes: tuple,
+) -> tuple:
+    """
+    (query_params, sql_string, sql_params) for one entity combination.
+    Paraphrases of the same question resolve to the same entities, so the
+    SQL is built once per signature. query_params is shared between
+    callers; treat it as read-only.
+    """
+    query_params = build_query_params(
+        course_code=course_code,
+        instructor_name=instructor_name,
+        weekdays=list(weekdays),
+        requested_attributes=list(requested_attributes)
+    )
+    sql_string, sql_params = build_sql_string(query_params)
+    return query_params, sql_string, tuple(sql_params)
+
+
 def inject_db_results(query_result: Dict[str, Any], db_rows: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
     """
     Inject DB results back into query result structure.
@@ -373,11 +424,11 @@ def inject_db_results(query_result: Dict[str, Any], db_rows: List[List[Dict[str,
     """
     subqueries = query_result.get("subqueries", [])
     
-    for i, subq in enumerate(subqueries):
-        if i < len(db_rows):
-            subq["rows"] = db_rows[i]
-        else:
-            subq["rows"] = []
+    # Rows arrive in subquery order; any subquery without rows gets []
+    for subq, rows in zip(subqueries, db_rows):
+        subq["rows"] = rows
+    for subq in subqueries[len(db_rows):]:
+        subq["rows"] = []
     
     return {"subresults": subqueries}
 
@@ -0,0 +1,39 @@
+# embed_cache.py
+# ============================================================
+# Process-wide SentenceTransformer instances, cached by model name
+# and dtype, so every consumer of the same embedder shares one set
+# of weights.
+# ============================================================
+
+from functools import lru_cache
+from typing import Optional
+
+from sentence_transformers import SentenceTransformer
+
+
+def _with_fast_tokenizer(embedder: SentenceTransformer) -> SentenceTransformer:
+    """
+    Swap in the Rust ("fast") HuggingFace tokenizer if the model shipped a slow one.
+    Same token ids, so this is safe for every consumer of the shared instance.
+    """
+    tok = getattr(embedder, "tokenizer", None)
+    if tok is not None and not getattr(tok, "is_fast", True):
+        from transformers import AutoTokenizer
+        embedder.tokenizer = AutoTokenizer.from_pretrained(tok.name_or_path, use_fast=True)
+    return embedder
+
+
+@lru_cache(maxsize=4)
+def get_shared_embedder(name: str, dtype: Optional[str] = None) -> SentenceTransformer:
+    """
+    Load `name` once per dtype and return the same instance on every later call.
+
+    dtype (a torch dtype name, e.g. "bfloat16") casts the weights of that
+    instance only; it is part of the cache key, so callers asking for the
+    default precision never see a cast model.
+    """
+    embedder = _with_fast_tokenizer(SentenceTransformer(name))
+    if dtype is not None:
+        import torch
+        embedder.to(getattr(torch, dtype))
+    return embedder
@@ -2,67 +2,210 @@
 # ============================================================
 # Runtime Layer-1 intent classifier
 #  - Loads intent_model.joblib (trained with train_intent_classifier.py)
-#  - Uses sentence-transformers to embed text
+#  - Uses sentence-transformers to embed text (or, if exported with
+#    training/export_intent_onnx.py, an int8 ONNX Runtime model;
+#    or Model2Vec static embeddings if the bundle was trained on them)
 #  - Exposes: classify_intent(text) -> dict
 # ============================================================
 
+import os
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Any
 import numpy as np
 import joblib
-from sentence_transformers import SentenceTransformer
+from scipy.special import expit, softmax
+
+from .embed_cache import get_shared_embedder
+
+try:
+    import torch
+    # default intra-op pool oversubscribes on hyperthreaded CPUs for tiny batches
+    torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+except ImportError:
+    torch = None
 
 MODEL_BUNDLE_PATH = "models/intent/intent_model.joblib"
+EMBED_CACHE_SIZE = 4096
+ENCODE_BATCH_SIZE = 32
+
+# quantized ONNX export of the embedder; used instead of PyTorch when present
+ONNX_MODEL_DIR = "models/intent/onnx"
+ONNX_MODEL_FILE = "model_quantized.onnx"
+
+
+class OnnxEmbedder:
+    """
+    Minimal SentenceTransformer stand-in backed by ONNX Runtime.
+    Reproduces the all-mpnet-base-v2 head: mean pooling + L2 normalization.
+    """
+
+    def __init__(self, model_dir: str, file_name: str = ONNX_MODEL_FILE):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, file_name),
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, sentences, batch_size: int = ENCODE_BATCH_SIZE, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        chunks = []
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            feats = self.tokenizer(batch, padding=True, truncation=True, return_tensors="np")
+            feeds = {k: v for k, v in feats.items() if k in self._input_names}
+            hidden = self.session.run(None, feeds)[0]  # (batch, seq, dim)
+
+            mask = feats["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            chunks.append(pooled.astype(np.float32))
+
+        embs = np.concatenate(chunks, axis=0)
+        return embs[0] if single else embs
+
+
+def _load_embedder(model_name: str, backend: str = "sentence-transformers"):
+    """
+    Load the embedder the bundle was trained with.
+    Transformer bundles prefer the exported ONNX model over SentenceTransformer.
+    """
+    if backend == "model2vec":
+        from model2vec import StaticModel
+        return StaticModel.from_pretrained(model_name)
+
+    if os.path.exists(os.path.join(ONNX_MODEL_DIR, ONNX_MODEL_FILE)):
+        try:
+            return OnnxEmbedder(ONNX_MODEL_DIR)
+        except ImportError:
+            pass
+    # bfloat16 forward pass on CPUs with native AVX512-BF16 (half the weight
+    # bandwidth); encode() still returns float32 vectors. The shared cache keys
+    # on dtype, so other users of the model keep their float32 instance.
+    return get_shared_embedder(model_name, "bfloat16" if _cpu_supports_bf16() else None)
+
+
+def _cpu_supports_bf16() -> bool:
+    if torch is None:
+        return False
+    # private helper; its name has changed across torch releases
+    for name in ("_is_avx512_bf16_supported", "_is_cpu_support_avx512_bf16"):
+        fn = getattr(torch.cpu, name, None)
+        if fn is not None:
+            try:
+                return bool(fn())
+            except Exception:
+                return False
+    return False
 
 
 class IntentClassifier:
     def __init__(self, model_path: str = MODEL_BUNDLE_PATH):
+        # the bundle is saved compressed, which joblib can't memory-map; coef_
+        # is re-quantized into a private copy below anyway
         bundle = joblib.load(model_path)
         self.embed_model_name: str = bundle["embed_model_name"]
+        self.embed_backend: str = bundle.get("embed_backend", "sentence-transformers")
         self.label_classes: List[str] = list(bundle["label_classes"])
         self.clf = bundle["classifier"]
 
+        # Linear models are scored inline (one GEMV + softmax) instead of going
+        # through predict_proba's validation and dispatch on every query
+        coef = getattr(self.clf, "coef_", None)
+        if coef is not None:
+            # float32 weights: a BLAS GEMV beats an int8 matmul here, since
+            # numpy's integer matmul doesn't go through BLAS
+            self._W = np.ascontiguousarray(coef, dtype=np.float32)
+            self._b = np.asarray(self.clf.intercept_, dtype=np.float32)
+            self._ovr = getattr(self.clf, "multi_class", None) == "ovr"
+        else:
+            self._W = self._b = None
+
         # load the same embedding model used during training
-        self.embedder = SentenceTransformer(self.embed_model_name)
+        self.embedder = _load_embedder(self.embed_model_name, self.embed_backend)
 
-    def classify_intent(self, text: str, top_k: int = 3) -> Dict[str, Any]:
-        """
-        Classify a single user query into an intent.
+        # per-instance LRU of query embeddings (repeated queries skip the encoder);
+        # shared by classify_intent and classify_batch
+        self._emb_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._emb_lock = threading.Lock()
 
-        Returns:
-            {
-              "primary_intent": str,
-              "confidence": float,
-              "probs": {label: prob, ...},
-              "top_k": [(label, prob), ...]
-            }
-        """
-        text = (text or "").strip()
-        if not text:
-            return {
-                "primary_intent": "chitchat",
-                "confidence": 0.0,
-                "probs": {lbl: 0.0 for lbl in self.label_classes},
-                "top_k": [],
-            }
+    def _cache_get(self, text: str):
+        with self._emb_lock:
+            emb = self._emb_cache.get(text)
+            if emb is not None:
+                self._emb_cache.move_to_end(text)
+            return emb
+
+    def _cache_put(self, text: str, emb: np.ndarray) -> None:
+        emb.setflags(write=False)  # shared through the cache
+        with self._emb_lock:
+            self._emb_cache[text] = emb
+            self._emb_cache.move_to_end(text)
+            if len(self._emb_cache) > EMBED_CACHE_SIZE:
+                self._emb_cache.popitem(last=False)
 
-        emb = self.embedder.encode([text])
-        emb = np.asarray(emb)
+    def _embed_cached(self, text: str) -> np.ndarray:
+        """(1, dim) embedding of text, from the LRU or the encoder."""
+        emb = self._cache_get(text)
+        if emb is None:
+            # a bare string encodes straight to a 1-D ndarray; no list / asarray round-trip
+            emb = self.embedder.encode(text, convert_to_numpy=True, show_progress_bar=False)
+            emb = emb.reshape(1, -1)
+            self._cache_put(text, emb)
+        return emb
 
-        # LogisticRegression has predict_proba
-        probs = self.clf.predict_proba(emb)[0]  # shape (num_classes,)
+    def warmup(self) -> None:
+        """Run one encode + scoring pass without touching the embedding LRU."""
+        emb = self.embedder.encode("warmup", convert_to_numpy=True, show_progress_bar=False)
+        self._predict_proba(np.asarray(emb).reshape(1, -1))
+
+    def _predict_proba(self, embs: np.ndarray) -> np.ndarray:
+        """Class probabilities for a (n, dim) batch of embeddings."""
+        if self._W is None:
+            return self.clf.predict_proba(embs)
+
+        scores = embs.astype(np.float32, copy=False) @ self._W.T + self._b
+        if self._W.shape[0] == 1:
+            # binary LogisticRegression keeps one row of weights for the positive class
+            p = expit(scores)
+            return np.hstack([1.0 - p, p])
+        if self._ovr:
+            p = expit(scores)
+            return p / p.sum(axis=1, keepdims=True)
+        return softmax(scores, axis=1)
+
+    def _empty_result(self) -> Dict[str, Any]:
+        return {
+            "primary_intent": "chitchat",
+            "confidence": 0.0,
+            "probs": {lbl: 0.0 for lbl in self.label_classes},
+            "top_k": [],
+        }
+
+    def _build_result(self, probs: np.ndarray, top_k: int) -> Dict[str, Any]:
         best_idx = int(np.argmax(probs))
         best_label = self.label_classes[best_idx]
         best_conf = float(probs[best_idx])
 
-        probs_dict = {
-            label: float(p)
-            for label, p in zip(self.label_classes, probs)
-        }
+        probs_list = probs.tolist()
+        probs_dict = dict(zip(self.label_classes, probs_list))
 
+        # partial selection of the k best, then sort only those k
         top_k = min(top_k, len(self.label_classes))
-        sorted_indices = np.argsort(probs)[::-1][:top_k]
+        if top_k > 0:
+            idx = np.argpartition(probs, -top_k)[-top_k:]
+            sorted_indices = idx[np.argsort(-probs[idx], kind="stable")].tolist()
+        else:
+            sorted_indices = []
         top_k_list = [
-            (self.label_classes[int(i)], float(probs[int(i)]))
+            (self.label_classes[i], probs_list[i])
             for i in sorted_indices
         ]
 
@@ -73,15 +216,74 @@ class IntentClassifier:
             "top_k": top_k_list,
         }
 
+    def classify_intent(self, text: str, top_k: int = 3) -> Dict[str, Any]:
+        """
+        Classify a single user query into an intent.
+
+        Returns:
+            {
+              "primary_intent": str,
+              "confidence": float,
+              "probs": {label: prob, ...},
+              "top_k": [(label, prob), ...]
+            }
+        """
+        text = (text or "").strip()
+        if not text:
+            return self._empty_result()
+
+        emb = self._embed_cached(text)
+
+        probs = self._predict_proba(emb)[0]  # shape (num_classes,)
+        return self._build_result(probs, top_k)
+
+    def classify_batch(self, texts: List[str], top_k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Classify several queries with one encoder call and one predict_proba.
+
+        SentenceTransformer.encode already length-sorts its input into
+        batches, so texts are passed through as-is (deduplicated). Texts
+        already in the embedding LRU skip the encoder; new ones are added.
+        """
+        cleaned = [(t or "").strip() for t in texts]
+        unique = [t for t in dict.fromkeys(cleaned) if t]
+
+        by_text: Dict[str, Dict[str, Any]] = {}
+        if unique:
+            embs_by_text = {t: self._cache_get(t) for t in unique}
+            misses = [t for t, e in embs_by_text.items() if e is None]
+            if misses:
+                new_embs = np.asarray(self.embedder.encode(misses, batch_size=ENCODE_BATCH_SIZE))
+                for t, emb in zip(misses, new_embs):
+                    emb = emb.reshape(1, -1).copy()  # own row, not a view of the batch
+                    self._cache_put(t, emb)
+                    embs_by_text[t] = emb
+            embs = np.vstack([embs_by_text[t] for t in unique])
+            all_probs = self._predict_proba(embs)
+            by_text = {
+                t: self._build_result(p, top_k)
+                for t, p in zip(unique, all_probs)
+            }
+
+        return [by_text[t] if t else self._empty_result() for t in cleaned]
+
 
 # optional singleton for easy import
 _classifier_singleton: IntentClassifier | None = None
+_cls_lock = threading.Lock()
 
 
 def get_intent_classifier() -> IntentClassifier:
     global _classifier_singleton
+    # double-checked locking: only the first concurrent callers ever take the lock
     if _classifier_singleton is None:
-        _classifier_singleton = IntentClassifier(MODEL_BUNDLE_PATH)
+        with _cls_lock:
+            if _classifier_singleton is None:
+                clf = IntentClassifier(MODEL_BUNDLE_PATH)
+                # pay first-call kernel/allocator setup here, not on the first
+                # query (callers such as the chat window load us off the UI thread)
+                clf.warmup()
+                _classifier_singleton = clf
     return _classifier_singleton
 
 
@@ -1,7 +1,9 @@
+import os
 import sqlite3
+import string
 import json
 import sys
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from .config import DB_PATH, TABLE_NAME
 
 #DB_PATH = "courses_metcs.sqlite"
@@ -51,40 +53,91 @@ def run_subquery(cursor: sqlite3.Cursor, subquery: Dict[str, Any]) -> List[Dict[
 
     return results
 
+# Per database file: (file version, distinct (folded name, course_number,
+# course_name) rows), so name searches don't re-scan the table every time.
+_title_indexes: Dict[str, Tuple[Tuple[int, int], List[Tuple[str, str, str]]]] = {}
+
+# SQLite's LOWER()/LIKE only fold ASCII letters; fold names the same way
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _db_file(cursor: sqlite3.Cursor) -> str:
+    """Path of the main database behind cursor ('' for in-memory/temp DBs)."""
+    cursor.execute("PRAGMA database_list")
+    for _seq, name, path in cursor.fetchall():
+        if name == "main":
+            return path or ""
+    return ""
+
+
+def _db_version(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _get_title_index(cursor: sqlite3.Cursor) -> List[Tuple[str, str, str]]:
+    """
+    Return the course title index for cursor's database, reloading it if that
+    file changed. In-memory databases have no file to key on and are not cached.
+    """
+    path = _db_file(cursor)
+    key = _db_version(path) if path else None
+    cached = _title_indexes.get(path)
+    if key is not None and cached is not None and cached[0] == key:
+        return cached[1]
+
+    # NULL names never match LIKE, so they are left out of the index
+    cursor.execute("""
+        SELECT DISTINCT course_number, course_name
+        FROM public_classes
+        WHERE course_name IS NOT NULL
+        ORDER BY course_number
+    """)
+    index = [
+        (name.translate(_ASCII_LOWER), number, name)
+        for number, name in cursor.fetchall()
+    ]
+    if key is not None:
+        _title_indexes[path] = (key, index)
+    return index
+
+
 def fuzzy_search_courses(cursor: sqlite3.Cursor, search_term: str) -> List[Dict[str, Any]]:
     """
     Fuzzy search for courses by name.
     Returns list of matching courses with their codes.
     """
-    search_pattern = f"%{search_term.lower()}%"
-    
-    # DEBUG: Print what we're searching for
-    print(f"DEBUG: Searching for pattern: {search_pattern}", file=sys.stderr)
+    term = search_term.lower()
     
-    sql = """
-        SELECT DISTINCT course_number, course_name 
-        FROM public_classes 
-        WHERE LOWER(course_name) LIKE ?
-        ORDER BY course_number
-    """
+    if "%" in term or "_" in term:
+        # LIKE wildcards in the term: let SQLite do the matching
+        cursor.execute("""
+            SELECT DISTINCT course_number, course_name 
+            FROM public_classes 
+            WHERE LOWER(course_name) LIKE ?
+            ORDER BY course_number
+        """, [f"%{term}%"])
+        results = [
+            {"course_number": number, "course_name": name}
+            for number, name in cursor.fetchall()
+        ]
+    else:
+        # Same rows as LOWER(course_name) LIKE '%term%' (ASCII-only case
+        # folding, NULL names excluded), matched against the in-memory title
+        # index instead of a full table scan per search
+        term = term.translate(_ASCII_LOWER)
+        results = [
+            {"course_number": number, "course_name": name}
+            for lname, number, name in _get_title_index(cursor)
+            if term in lname
+        ]
     
-    # DEBUG: Print the SQL
-    print(f"DEBUG: SQL = {sql}", file=sys.stderr)
-    
-    cursor.execute(sql, [search_pattern])
-    
-    # DEBUG: Check what we got
-    column_names = [desc[0] for desc in cursor.description]
-    print(f"DEBUG: Columns = {column_names}", file=sys.stderr)
+    print(f"DEBUG: Fuzzy search '{term}' -> {len(results)} row(s)", file=sys.stderr)
     
-    rows = cursor.fetchall()
-    print(f"DEBUG: Row count = {len(rows)}", file=sys.stderr)
-    print(f"DEBUG: Rows = {rows}", file=sys.stderr)
-    
-    return [
-        {col: value for col, value in zip(column_names, row)}
-        for row in rows
-    ]
+    return results
 
 def handle_request(payload: Dict[str, Any]) -> Any:
     """
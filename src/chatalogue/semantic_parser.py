@@ -11,6 +11,7 @@
 from .intent_classifier import get_intent_classifier
 from .config import NER_PATH
 import re
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 import sys
 
@@ -30,6 +31,7 @@ def get_ner_model():
         try:
             print("🔄 Loading NER model...", file=sys.stderr)
             _NER_MODEL = spacy.load(NER_PATH)
+            _ner_spans.cache_clear()
             print("✅ NER model loaded successfully", file=sys.stderr)
         except Exception as e:
             print(f"⚠️  NER model not found, NER model not available: {e}", file=sys.stderr)
@@ -204,6 +206,25 @@ def _split_on_and_with_course_names(clauses: List[str]) -> List[str]:
 # NER EXTRACTION (Primary Method - 98.8% Accurate)
 # ============================================================
 
+_NER_LABEL_KEYS: Dict[str, str] = {
+    "INSTRUCTOR": "instructors",
+    "COURSE_CODE": "course_codes",
+    "COURSE_NAME": "course_names",
+    "WEEKDAY": "weekdays",
+    "TIME": "times",
+    "BUILDING": "buildings",
+    "SECTION": "sections",
+}
+
+
+@lru_cache(maxsize=1024)
+def _ner_spans(nlp, text: str) -> Tuple[Tuple[str, str], ...]:
+    """(label, text) for each entity. Memoized: a multi-clause query runs NER
+    on the full text, on each clause and again while splitting on course names."""
+    doc = nlp(text)
+    return tuple((ent.label_, ent.text.strip()) for ent in doc.ents)
+
+
 def extract_entities_ner(text: str) -> Dict[str, List[str]]:
     """
     Extract entities using NER model (98.8% F1-score).
@@ -226,11 +247,12 @@ def extract_entities_ner(text: str) -> Dict[str, List[str]]:
         return empty_result
     
     try:
-        doc = nlp(text)
+        spans = _ner_spans(nlp, text)
     except Exception as e:
         print(f"⚠️  NER extraction error: {e}", file=sys.stderr)
         return empty_result
     
+    # Fresh lists every call: callers edit these in place
     entities = {
         "instructors": [],
         "course_codes": [],
@@ -241,23 +263,10 @@ def extract_entities_ner(text: str) -> Dict[str, List[str]]:
         "sections": []
     }
     
-    for ent in doc.ents:
-        entity_text = ent.text.strip()
-        
-        if ent.label_ == "INSTRUCTOR":
-            entities["instructors"].append(entity_text)
-        elif ent.label_ == "COURSE_CODE":
-            entities["course_codes"].append(entity_text)
-        elif ent.label_ == "COURSE_NAME":
-            entities["course_names"].append(entity_text)
-        elif ent.label_ == "WEEKDAY":
-            entities["weekdays"].append(entity_text)
-        elif ent.label_ == "TIME":
-            entities["times"].append(entity_text)
-        elif ent.label_ == "BUILDING":
-            entities["buildings"].append(entity_text)
-        elif ent.label_ == "SECTION":
-            entities["sections"].append(entity_text)
+    for label, entity_text in spans:
+        key = _NER_LABEL_KEYS.get(label)
+        if key is not None:
+            entities[key].append(entity_text)
     
     return entities
 
@@ -411,26 +420,36 @@ def extract_weekdays(text: str) -> List[str]:
 # REST OF ORIGINAL CODE (Unchanged)
 # ============================================================
 
+# Attribute trigger words (substring matches, like the original `w in text`)
+_ATTR_TRIGGERS: Dict[str, str] = {
+    "who": "instructor", "instructor": "instructor", "professor": "instructor",
+    "prof": "instructor", "teach": "instructor",
+    "where": "location", "location": "location", "room": "location", "building": "location",
+    "when": "time", "time": "time", "schedule": "time", "meet": "time",
+    "sections": "sections", "section": "sections",
+}
+_ATTR_ORDER = ("instructor", "location", "time", "sections")
+
+# One pass over the text; the lookahead reports overlapping hits so every
+# trigger substring is seen, exactly as the separate `in` checks did
+_ATTR_TRIGGER_RE = re.compile(
+    "(?=(" + "|".join(sorted(map(re.escape, _ATTR_TRIGGERS), key=len, reverse=True)) + "))"
+)
+_SECTION_KEYWORD_RE = re.compile(r'\b(?:section|sec)\s+([A-Z]\d{1,2})\b', re.IGNORECASE)
+_TRAILING_SECTION_RE = re.compile(r'[A-Z]\d{1,2}$')
+
+
 def detect_requested_attributes(text: str) -> List[str]:
     """Detect what information user is asking about."""
-    text_lower = text.lower()
-    attrs: List[str] = []
-    
-    if any(w in text_lower for w in ["who", "instructor", "professor", "prof", "teach"]):
-        attrs.append("instructor")
-    if any(w in text_lower for w in ["where", "location", "room", "building"]):
-        attrs.append("location")
-    if any(w in text_lower for w in ["when", "time", "schedule", "meet"]):
-        attrs.append("time")
-    if any(w in text_lower for w in ["section", "sections"]):
-        attrs.append("sections")
+    found = {_ATTR_TRIGGERS[m.group(1)] for m in _ATTR_TRIGGER_RE.finditer(text.lower())}
+    attrs: List[str] = [a for a in _ATTR_ORDER if a in found]
     
     return attrs if attrs else ["info"]
 
 
 def extract_section_from_text(text: str) -> str:
     """Extract section like 'section B3' or 'sec A1'."""
-    match = re.search(r'\b(?:section|sec)\s+([A-Z]\d{1,2})\b', text, re.IGNORECASE)
+    match = _SECTION_KEYWORD_RE.search(text)
     if match:
         return match.group(1).upper()
     return ""
@@ -624,7 +643,7 @@ def build_semantic_parse(user_input: str, context: Optional[Any] = None) -> Dict
     section_from_keyword = extract_section_from_text(raw)
     if section_from_keyword and global_course_codes:
         first_code = global_course_codes[0]
-        if not re.search(r'[A-Z]\d{1,2}$', first_code):
+        if not _TRAILING_SECTION_RE.search(first_code):
             global_course_codes[0] = f"{first_code} {section_from_keyword}"
 
     # Multi-query handling
@@ -657,7 +676,7 @@ def build_semantic_parse(user_input: str, context: Optional[Any] = None) -> Dict
         c_section = extract_section_from_text(clause)
         if c_section and c_codes:
             first_code = c_codes[0]
-            if not re.search(r'[A-Z]\d{1,2}$', first_code):
+            if not _TRAILING_SECTION_RE.search(first_code):
                 c_codes[0] = f"{first_code} {c_section}"
 
         subqueries.append({
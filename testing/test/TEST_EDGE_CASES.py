@@ -3,6 +3,7 @@
 # Comprehensive test suite for chatbot with pass/fail tracking
 # ============================================================
 
+import io
 import sys
 from typing import List, Tuple, Optional
 from semantic_parser import build_semantic_parse
@@ -137,22 +138,39 @@ def run_single_test(query: str, expected: List[str], description: str, context:
         return False, f"ERROR: {str(e)}"
 
 
+# Report output is collected here and written to stdout at checkpoints
+# instead of one print() per line
+_out = io.StringIO()
+
+
+def _emit(line: str = "") -> None:
+    _out.write(line)
+    _out.write("\n")
+
+
+def _flush() -> None:
+    sys.stdout.write(_out.getvalue())
+    sys.stdout.flush()
+    _out.seek(0)
+    _out.truncate()
+
+
 def run_all_tests():
     """Run all test cases and print results."""
     
-    print("=" * 120)
-    print("CHATBOT COMPREHENSIVE TEST SUITE")
-    print("=" * 120)
-    print()
+    _emit("=" * 120)
+    _emit("CHATBOT COMPREHENSIVE TEST SUITE")
+    _emit("=" * 120)
+    _emit()
     
     total = 0
     passed = 0
     failed_tests = []
     
     # ==================== INDIVIDUAL TESTS ====================
-    print("=" * 120)
-    print("INDIVIDUAL TEST CASES")
-    print("=" * 120)
+    _emit("=" * 120)
+    _emit("INDIVIDUAL TEST CASES")
+    _emit("=" * 120)
     
     for query, expected, description in TEST_CASES:
         total += 1
@@ -165,19 +183,21 @@ def run_all_tests():
         else:
             failed_tests.append((description, query, expected, answer))
         
-        print(f"{status} | {description:40} | {query[:50]:50}")
+        _emit(f"{status} | {description:40} | {query[:50]:50}")
         if not test_passed:
-            print(f"      Expected: {expected}")
-            print(f"      Got: {answer[:100]}")
-            print()
+            _emit(f"      Expected: {expected}")
+            _emit(f"      Got: {answer[:100]}")
+            _emit()
+    
+    _flush()
     
     # ==================== CONTEXT TESTS ====================
-    print("\n" + "=" * 120)
-    print("CONTEXT-DEPENDENT TEST SEQUENCES")
-    print("=" * 120)
+    _emit("\n" + "=" * 120)
+    _emit("CONTEXT-DEPENDENT TEST SEQUENCES")
+    _emit("=" * 120)
     
     for seq_idx, sequence in enumerate(CONTEXT_TEST_SEQUENCES):
-        print(f"\nSequence {seq_idx + 1}:")
+        _emit(f"\nSequence {seq_idx + 1}:")
         context = ConversationContext()
         
         for query, expected, description in sequence:
@@ -191,30 +211,33 @@ def run_all_tests():
             else:
                 failed_tests.append((f"Seq{seq_idx+1}: {description}", query, expected, answer))
             
-            print(f"  {status} | {description:35} | {query[:45]:45}")
+            _emit(f"  {status} | {description:35} | {query[:45]:45}")
             if not test_passed:
-                print(f"        Expected: {expected}")
-                print(f"        Got: {answer[:90]}")
+                _emit(f"        Expected: {expected}")
+                _emit(f"        Got: {answer[:90]}")
+    
+    _flush()
     
     # ==================== SUMMARY ====================
-    print("\n" + "=" * 120)
-    print(f"TEST SUMMARY: {passed}/{total} passed ({passed/total*100:.1f}%)")
-    print("=" * 120)
+    _emit("\n" + "=" * 120)
+    _emit(f"TEST SUMMARY: {passed}/{total} passed ({passed/total*100:.1f}%)")
+    _emit("=" * 120)
     
     if failed_tests:
-        print("\n" + "=" * 120)
-        print(f"FAILED TESTS ({len(failed_tests)}):")
-        print("=" * 120)
+        _emit("\n" + "=" * 120)
+        _emit(f"FAILED TESTS ({len(failed_tests)}):")
+        _emit("=" * 120)
         
         for description, query, expected, answer in failed_tests:
-            print(f"\n❌ {description}")
-            print(f"   Query: {query}")
-            print(f"   Expected: {expected}")
-            print(f"   Got: {answer[:150]}")
+            _emit(f"\n❌ {description}")
+            _emit(f"   Query: {query}")
+            _emit(f"   Expected: {expected}")
+            _emit(f"   Got: {answer[:150]}")
     else:
-        print("\n🎉 ALL TESTS PASSED! 🎉")
+        _emit("\n🎉 ALL TESTS PASSED! 🎉")
     
-    print()
+    _emit()
+    _flush()
     return passed == total
 
 
@@ -225,26 +248,27 @@ def run_all_tests():
 def interactive_test():
     """Run tests interactively - see output for each test."""
     
-    print("=" * 120)
-    print("INTERACTIVE TEST MODE")
-    print("=" * 120)
-    print("Press Enter after each test to continue, or 'q' to quit\n")
+    _emit("=" * 120)
+    _emit("INTERACTIVE TEST MODE")
+    _emit("=" * 120)
+    _emit("Press Enter after each test to continue, or 'q' to quit\n")
     
     context = ConversationContext()
     
     for query, expected, description in TEST_CASES:
-        print(f"\n{'='*120}")
-        print(f"TEST: {description}")
-        print(f"Query: {query}")
-        print(f"Expected to contain: {expected}")
-        print(f"{'='*120}")
+        _emit(f"\n{'='*120}")
+        _emit(f"TEST: {description}")
+        _emit(f"Query: {query}")
+        _emit(f"Expected to contain: {expected}")
+        _emit(f"{'='*120}")
         
         test_passed, answer = run_single_test(query, expected, description)
         
         status = "✅ PASS" if test_passed else "❌ FAIL"
-        print(f"\n{status}")
-        print(f"Answer: {answer}")
+        _emit(f"\n{status}")
+        _emit(f"Answer: {answer}")
         
+        _flush()
         user_input = input("\nPress Enter to continue (or 'q' to quit): ")
         if user_input.lower() == 'q':
             break
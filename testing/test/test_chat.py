@@ -1,7 +1,56 @@
 import unittest
 
+import pytest
 import tkinter as tk
-import chat_window
+from chatalogue import chat_window
+
+
+# ------------------------------------------------------------
+#  Fixtures
+# ------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def _app_slot():
+    # Holds the one ChatApp (and so the one Tcl interpreter) for the module;
+    # it is only replaced when a test leaves it in a state clear_chat can't undo
+    slot = []
+    yield slot
+    for a in slot:
+        a.destroy()
+
+
+def _current_app(slot):
+    if not slot:
+        a = chat_window.ChatApp(warm_models=False)
+        a.withdraw()
+        slot.append(a)
+    return slot[0]
+
+
+@pytest.fixture
+def root(_app_slot):
+    # Bubbles go in a throwaway frame on the shared app rather than a second Tk root
+    frame = tk.Frame(_current_app(_app_slot))
+    yield frame
+    frame.destroy()
+
+
+@pytest.fixture
+def app(_app_slot, monkeypatch):
+    # clear_chat asks for confirmation; answer "yes" without a dialog
+    monkeypatch.setattr(chat_window.messagebox, "askyesno", lambda *a, **k: True)
+    a = _current_app(_app_slot)
+    yield a
+    # Back to the fresh-app state (welcome message only) for the next test,
+    # or throw the app away (executor and worker included) if that fails
+    try:
+        a.clear_chat()
+        clean = len(a.history) == 1
+    except Exception:
+        clean = False
+    if not clean:
+        _app_slot.remove(a)
+        a.destroy()
 
 
 # ------------------------------------------------------------
@@ -23,6 +72,14 @@ def test_blend_mid():
     assert chat_window.blend((0, 0, 0), (255, 255, 255), 0.5) == (127, 127, 127)
 
 
+def test_blend_batch_matches_scalar():
+    c1, c2 = (10, 200, 30), (250, 5, 77)
+    ts = [i / 8 for i in range(8)]
+    batch = chat_window.rgb_to_hex_batch(chat_window.blend_batch(c1, c2, ts))
+    assert batch == [chat_window.rgb_to_hex(chat_window.blend(c1, c2, t)) for t in ts]
+    assert chat_window.hex_to_rgb_batch(["#ff0000", "#00ff10"]).tolist() == [[255, 0, 0], [0, 255, 16]]
+
+
 def test_now_ts():
     ts = chat_window.now_ts()
     assert isinstance(ts, str)
@@ -33,74 +90,50 @@ def test_now_ts():
 #  ChatBubble Tests (no mocks required)
 # ------------------------------------------------------------
 
-def test_chatbubble_creation():
-    root = tk.Tk()
-    root.withdraw()
-
+def test_chatbubble_creation(root):
     bubble = chat_window.ChatBubble(root, "Hello world", sender="user")
 
     assert bubble.text == "Hello world"
     assert bubble.sender == "user"
 
-    root.destroy()
+    bubble.destroy()
 
 
-def test_chatbubble_clipboard_copy():
-    root = tk.Tk()
-    root.withdraw()
-
+def test_chatbubble_clipboard_copy(root):
     bubble = chat_window.ChatBubble(root, "Copy this text")
     bubble.copy_to_clipboard()
 
     assert root.clipboard_get() == "Copy this text"
 
-    root.destroy()
+    bubble.destroy()
 
 
 # ------------------------------------------------------------
 #  ChatApp Tests (runs without mocks)
 # ------------------------------------------------------------
 
-def test_chatapp_initialization():
-    app = chat_window.ChatApp()
-    app.withdraw()
-
+def test_chatapp_initialization(app):
     # verify widgets exist
     assert hasattr(app, "chat_canvas")
     assert hasattr(app, "user_input")
     assert hasattr(app, "chat_frame")
 
-    app.destroy()
-
-
-def test_add_user_message():
-    app = chat_window.ChatApp()
-    app.withdraw()
 
+def test_add_user_message(app):
     app.add_user("test message")
 
     assert "You: test message" in app.history
     assert len(app.history) == 2
 
-    app.destroy()
-
-
-def test_add_bot_message():
-    app = chat_window.ChatApp()
-    app.withdraw()
 
+def test_add_bot_message(app):
     app.add_bot("bot reply")
 
     assert "Bot: bot reply" in app.history
     assert len(app.history) == 2
 
-    app.destroy()
-
-
-def test_copy_all_copies_to_clipboard():
-    app = chat_window.ChatApp()
-    app.withdraw()
 
+def test_copy_all_copies_to_clipboard(app):
     app.add_user("one")
     app.add_bot("two")
     app.copy_all()
@@ -109,13 +142,8 @@ def test_copy_all_copies_to_clipboard():
     assert "one" in clip
     assert "two" in clip
 
-    app.destroy()
-
-
-def test_clear_chat_removes_history():
-    app = chat_window.ChatApp()
-    app.withdraw()
 
+def test_clear_chat_removes_history(app):
     app.add_user("hi")
     app.add_bot("yo")
 
@@ -124,7 +152,5 @@ def test_clear_chat_removes_history():
     assert app.history == ['Bot:  Welcome to Chatalogue, your campus companion! Ask me about courses, '
  'campus life, or support.']
 
-    app.destroy()
-
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
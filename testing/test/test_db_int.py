@@ -157,6 +157,24 @@ def test_process_semantic_query_sql():
     assert "%smith%" in sub["sql_params"][1]
 
 
+def test_process_semantic_query_reuses_sql_for_same_entities():
+    sem = {
+        "primary_intent": "course_time",
+        "course_codes": ["CS 350"],
+        "requested_attributes": ["time"],
+        "raw_text": "when is cs 350",
+    }
+    paraphrase = dict(sem, raw_text="what time does cs 350 meet")
+
+    a = db.process_semantic_query(sem)["subqueries"][0]
+    b = db.process_semantic_query(paraphrase)["subqueries"][0]
+
+    assert a["sql_string"] is b["sql_string"]
+    assert a["sql_params"] == b["sql_params"]
+    assert a["sql_params"] is not b["sql_params"]  # callers get their own list
+    assert b["subquery_text"] == "what time does cs 350 meet"
+
+
 # -------------------------------------------------------
 # Test: _resolve_subqueries
 # -------------------------------------------------------
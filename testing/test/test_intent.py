@@ -1,6 +1,6 @@
 import pytest
 import numpy as np
-import intent_classifier as ic
+from chatalogue import intent_classifier as ic
 
 
 # --------------------------------------------------------
@@ -9,9 +9,14 @@ import intent_classifier as ic
 
 class FakeEmbedder:
     """Small dummy embedding model."""
-    def encode(self, texts):
-        # Always return deterministic vector
-        return [[0.1, 0.2, 0.3]]
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        # Always return deterministic vector (1-D for a single string)
+        self.calls += 1
+        vec = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+        return vec if isinstance(texts, str) else np.tile(vec, (len(texts), 1))
 
 
 class FakeClassifier:
@@ -24,6 +29,17 @@ class FakeClassifier:
         return self._probs
 
 
+class FakeLinearClassifier:
+    """Fake multinomial LogisticRegression exposing coef_/intercept_."""
+    def __init__(self, probs):
+        # zero weights + log-prob intercepts -> softmax(scores) == probs
+        self.coef_ = np.zeros((len(probs), 3))
+        self.intercept_ = np.log(np.asarray(probs))
+
+    def predict_proba(self, X):
+        raise AssertionError("linear models should be scored inline")
+
+
 @pytest.fixture
 def fake_model_bundle():
     return {
@@ -38,13 +54,13 @@ def fake_model_bundle():
 # --------------------------------------------------------
 
 def test_intent_classifier_init(monkeypatch, fake_model_bundle):
-    """Ensure the model loads joblib + SentenceTransformer correctly."""
+    """Ensure the model loads joblib + the shared embedder correctly."""
 
     # Fake joblib loader
-    monkeypatch.setattr(ic.joblib, "load", lambda path: fake_model_bundle)
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
 
-    # Fake SentenceTransformer
-    monkeypatch.setattr(ic, "SentenceTransformer", lambda name: FakeEmbedder())
+    # Fake shared SentenceTransformer
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
 
     clf = ic.IntentClassifier("fake.joblib")
 
@@ -60,8 +76,8 @@ def test_intent_classifier_init(monkeypatch, fake_model_bundle):
 def test_classify_intent_empty(monkeypatch, fake_model_bundle):
     """Empty input should return chitchat with zero confidence."""
 
-    monkeypatch.setattr(ic.joblib, "load", lambda path: fake_model_bundle)
-    monkeypatch.setattr(ic, "SentenceTransformer", lambda name: FakeEmbedder())
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
 
     clf = ic.IntentClassifier("dummy")
 
@@ -79,8 +95,8 @@ def test_classify_intent_empty(monkeypatch, fake_model_bundle):
 def test_classify_intent_normal(monkeypatch, fake_model_bundle):
     """Check main classification logic and top_k ordering."""
 
-    monkeypatch.setattr(ic.joblib, "load", lambda path: fake_model_bundle)
-    monkeypatch.setattr(ic, "SentenceTransformer", lambda name: FakeEmbedder())
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
 
     clf = ic.IntentClassifier("dummy")
 
@@ -108,8 +124,8 @@ def test_classify_intent_normal(monkeypatch, fake_model_bundle):
 def test_classify_intent_top_k(monkeypatch, fake_model_bundle):
     """Ensure top_k parameter works as expected."""
 
-    monkeypatch.setattr(ic.joblib, "load", lambda path: fake_model_bundle)
-    monkeypatch.setattr(ic, "SentenceTransformer", lambda name: FakeEmbedder())
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
 
     clf = ic.IntentClassifier("dummy")
 
@@ -119,6 +135,86 @@ def test_classify_intent_top_k(monkeypatch, fake_model_bundle):
     assert out["top_k"][0][0] == "instructor_lookup"
 
 
+# --------------------------------------------------------
+# Test: classify_intent() – inline linear scoring
+# --------------------------------------------------------
+
+def test_classify_intent_linear_scoring(monkeypatch, fake_model_bundle):
+    """Models with coef_ are scored without calling predict_proba."""
+
+    fake_model_bundle["classifier"] = FakeLinearClassifier([0.1, 0.7, 0.2])
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
+
+    clf = ic.IntentClassifier("dummy")
+
+    out = clf.classify_intent("When is CS101?")
+
+    assert out["primary_intent"] == "instructor_lookup"
+    assert out["confidence"] == pytest.approx(0.7, rel=1e-5)
+    assert [lbl for lbl, _ in out["top_k"]] == ["instructor_lookup", "chitchat", "course_info"]
+
+
+# --------------------------------------------------------
+# Test: repeated queries reuse the cached embedding
+# --------------------------------------------------------
+
+def test_classify_intent_caches_embedding(monkeypatch, fake_model_bundle):
+    """The encoder should only run once per distinct (stripped) query."""
+
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
+
+    clf = ic.IntentClassifier("dummy")
+
+    first = clf.classify_intent("Who teaches CS 521?")
+    second = clf.classify_intent("  Who teaches CS 521?  ")
+
+    assert clf.embedder.calls == 1
+    assert first == second
+
+
+# --------------------------------------------------------
+# Test: classify_batch()
+# --------------------------------------------------------
+
+def test_classify_batch(monkeypatch, fake_model_bundle):
+    """Batch results line up with the input, empty entries included."""
+
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
+
+    clf = ic.IntentClassifier("dummy")
+
+    out = clf.classify_batch(["When is CS101?", "", "When is CS101?"])
+
+    assert clf.embedder.calls == 1
+    assert len(out) == 3
+    assert out[0]["primary_intent"] == "instructor_lookup"
+    assert out[1]["primary_intent"] == "chitchat"
+    assert out[1]["top_k"] == []
+    assert out[2] == out[0]
+
+
+def test_classify_batch_shares_embedding_cache(monkeypatch, fake_model_bundle):
+    """classify_intent and classify_batch reuse each other's embeddings."""
+
+    fake_model_bundle["classifier"] = FakeLinearClassifier([0.1, 0.7, 0.2])
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
+
+    clf = ic.IntentClassifier("dummy")
+
+    single = clf.classify_intent("When is CS101?")
+    batch = clf.classify_batch(["When is CS101?", "Who teaches CS101?"])
+    assert clf.embedder.calls == 2  # only the new text was encoded
+    assert batch[0] == single
+
+    clf.classify_intent("Who teaches CS101?")
+    clf.classify_batch(["Who teaches CS101?", "When is CS101?"])
+    assert clf.embedder.calls == 2
+
+
 # --------------------------------------------------------
 # Test: get_intent_classifier singleton
 # --------------------------------------------------------
@@ -126,8 +222,8 @@ def test_classify_intent_top_k(monkeypatch, fake_model_bundle):
 def test_get_intent_classifier_singleton(monkeypatch, fake_model_bundle):
     """Singleton should only create classifier once."""
 
-    monkeypatch.setattr(ic.joblib, "load", lambda path: fake_model_bundle)
-    monkeypatch.setattr(ic, "SentenceTransformer", lambda name: FakeEmbedder())
+    monkeypatch.setattr(ic.joblib, "load", lambda path, **kwargs: fake_model_bundle)
+    monkeypatch.setattr(ic, "get_shared_embedder", lambda name, dtype=None: FakeEmbedder())
 
     # Reset module-level singleton
     ic._classifier_singleton = None
@@ -137,3 +233,5 @@ def test_get_intent_classifier_singleton(monkeypatch, fake_model_bundle):
 
     assert clf1 is clf2      # same instance
     assert isinstance(clf1, ic.IntentClassifier)
+    assert clf1.embedder.calls == 1   # warm-up encode ran once...
+    assert not clf1._emb_cache        # ...without caching its text
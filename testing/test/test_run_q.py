@@ -1,7 +1,9 @@
+import sqlite3
+
 import pytest
 from unittest.mock import MagicMock, patch
 
-import run_query
+from chatalogue import run_query
 
 
 # ============================================================
@@ -69,8 +71,8 @@ def test_run_subquery_basic():
 # handle_request
 # ============================================================
 
-@patch("run_query.disconnect_db")
-@patch("run_query.connect_db")
+@patch("chatalogue.run_query.disconnect_db")
+@patch("chatalogue.run_query.connect_db")
 def test_handle_request(mock_connect_db, mock_disconnect_db):
     # Mock database connection + cursor
     mock_conn = MagicMock()
@@ -123,3 +125,73 @@ def test_run_subquery_missing_sql_params():
 
     mock_cursor.execute.assert_called_once_with("SELECT * FROM table", [])
     assert results == [{"course_number": "CS 101", "section": "B2"}]
+
+
+# ============================================================
+# fuzzy_search_courses – title index is cached per database file
+# ============================================================
+
+def _make_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE public_classes (course_number TEXT, course_name TEXT)")
+    conn.executemany("INSERT INTO public_classes VALUES (?, ?)", rows)
+    conn.commit()
+    return conn
+
+
+def _like_search(cursor, term):
+    cursor.execute(
+        "SELECT DISTINCT course_number, course_name FROM public_classes "
+        "WHERE LOWER(course_name) LIKE ? ORDER BY course_number",
+        [f"%{term.lower()}%"],
+    )
+    return [{"course_number": n, "course_name": c} for n, c in cursor.fetchall()]
+
+
+def test_fuzzy_search_courses_reuses_title_index(tmp_path):
+    conn = _make_db(tmp_path / "a.db", [
+        ("MET CS 526", "Data Structures"),
+        ("MET CS 535", "Computer Networks"),
+    ])
+    statements = []
+    conn.set_trace_callback(statements.append)
+    cursor = conn.cursor()
+
+    first = run_query.fuzzy_search_courses(cursor, "Data")
+    second = run_query.fuzzy_search_courses(cursor, "NETWORKS")
+
+    assert first == [{"course_number": "MET CS 526", "course_name": "Data Structures"}]
+    assert second == [{"course_number": "MET CS 535", "course_name": "Computer Networks"}]
+    assert sum("public_classes" in s for s in statements) == 1
+    conn.close()
+
+
+def test_fuzzy_search_courses_index_is_per_database(tmp_path):
+    conn_a = _make_db(tmp_path / "a.db", [("MET CS 526", "Data Structures")])
+    conn_b = _make_db(tmp_path / "b.db", [("CAS MA 226", "Differential Equations")])
+
+    assert run_query.fuzzy_search_courses(conn_a.cursor(), "data") != []
+    assert run_query.fuzzy_search_courses(conn_b.cursor(), "data") == []
+    assert run_query.fuzzy_search_courses(conn_b.cursor(), "equations") == [
+        {"course_number": "CAS MA 226", "course_name": "Differential Equations"}
+    ]
+    conn_a.close()
+    conn_b.close()
+
+
+@pytest.mark.parametrize("term", ["", "data", "DATA", "100%", "c_s", "ÉCOLE", "école"])
+def test_fuzzy_search_courses_matches_sql_like(tmp_path, term):
+    # NULL names, LIKE wildcards and SQLite's ASCII-only LOWER() must all
+    # behave as they do in the equivalent SQL query
+    conn = _make_db(tmp_path / "a.db", [
+        ("MET CS 526", "Data Structures"),
+        ("MET CS 999", None),
+        ("MET CS 100", "100% Online"),
+        ("MET CS 101", "CxS Seminar"),
+        ("CAS FR 301", "École Française"),
+        ("CAS FR 302", "école d'été"),
+    ])
+    cursor = conn.cursor()
+
+    assert run_query.fuzzy_search_courses(cursor, term) == _like_search(cursor, term)
+    conn.close()
@@ -0,0 +1,49 @@
+# export_intent_onnx.py
+# ============================================================
+# Export the intent embedder to ONNX + int8 dynamic quantization
+#   - Output: models/intent/onnx/model_quantized.onnx (+ tokenizer files)
+#   - IntentClassifier picks this up automatically when present
+#
+# Requires: pip install "optimum[onnxruntime]"
+# ============================================================
+
+import os
+
+import joblib
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+# -------------------------
+# Config
+# -------------------------
+
+MODEL_BUNDLE_PATH = "models/intent/intent_model.joblib"
+OUTPUT_DIR = "models/intent/onnx"
+
+
+def main():
+    # 1) Read the embedder name from the trained bundle
+    bundle = joblib.load(MODEL_BUNDLE_PATH)
+    model_name = bundle["embed_model_name"]
+    if "/" not in model_name:
+        model_name = f"sentence-transformers/{model_name}"
+
+    # 2) Export to ONNX
+    print(f"Exporting {model_name} to ONNX...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(OUTPUT_DIR)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(OUTPUT_DIR)
+
+    # 3) Dynamic int8 quantization (VNNI dot products on supporting CPUs)
+    print("Quantizing (dynamic int8)...")
+    quantizer = ORTQuantizer.from_pretrained(model)
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=OUTPUT_DIR, quantization_config=qconfig)
+
+    print(f"\n✅ Saved quantized model to: {os.path.join(OUTPUT_DIR, 'model_quantized.onnx')}")
+
+
+if __name__ == "__main__":
+    main()
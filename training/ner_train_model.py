@@ -3,11 +3,19 @@
 Multi-Entity NER Training Script with Auto-Fix for Indices
 """
 
+import numpy as np
 import pandas as pd
 import spacy
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 from spacy.training import Example
 from spacy.util import minibatch, compounding
+import os
 import random
+import re
 from pathlib import Path
 import sys
 
@@ -17,6 +25,24 @@ OUTPUT_MODEL = "course_ner_model"
 N_ITER = 70
 TEST_SPLIT = 0.2
 
+# Evaluation inference batching; worker processes only pay off on large test
+# sets (each worker gets its own copy of the pipeline)
+EVAL_BATCH_SIZE = 256
+EVAL_MULTIPROCESS_MIN = 2000
+
+# Set by train_ner when spacy.prefer_gpu() succeeds; forked pipe workers
+# can't share the parent's CUDA context, so evaluation stays single-process
+_USING_GPU = False
+
+# Training progress line every PROGRESS_EVERY iterations (and on the last)
+PROGRESS_EVERY = 10
+BAR_LENGTH = 30
+BAR_FULL = '█' * BAR_LENGTH
+BAR_EMPTY = '░' * BAR_LENGTH
+
+# Rows per chunk when streaming the raw CSV in auto_fix_indices
+CSV_CHUNK_SIZE = 50_000
+
 # Entity labels
 ENTITY_LABELS = [
     "INSTRUCTOR",
@@ -28,73 +54,113 @@ ENTITY_LABELS = [
     "SECTION"
 ]
 
+# Training texts matching any of these are dropped
+PROBLEMATIC_PATTERNS = [
+    r'2pm-4pm', r'\d+pm-\d+pm', r'\d+am-\d+am',  # Time ranges
+    r'MonWedFri', r'TueThu', r'monwed',  # Concatenated days
+    r'Wed\.', r'Mon\.', r'Tue\.', r'Thu\.', r'Fri\.', r'Sat\.', r'Sun\.',  # Periods
+]
+_BAD_RE = re.compile("|".join(PROBLEMATIC_PATTERNS))
+
+
+def _fix_chunk(df):
+    """Recompute entity indices for one chunk of the raw CSV.
+
+    Returns (fixed_df, n_skipped).
+    """
+    n = len(df)
+    
+    # Column-wise instead of iterrows(): same rules as the old per-row loop
+    # (fillna: missing cells become 'nan', as str(NaN) did per row)
+    text = df['text'].fillna('nan').astype(str)
+    entity_text = df['entity_text'].fillna('nan').astype(str).str.strip()
+    entity_label = df['entity_label']
+    
+    # Non-entities (kept as NONE rows)
+    is_none = (
+        entity_label.isna() | (entity_label == 'NONE') |
+        (entity_text == '') | (entity_text == 'nan')
+    ).to_numpy()
+    
+    # Rows of a multi-entity sentence repeat its text; lowercase each
+    # distinct text once and share it across those rows
+    codes, uniques = pd.factorize(text)
+    uniq_l = [u.lower() for u in uniques]
+    text_l = [uniq_l[c] for c in codes]
+    ent_l = entity_text.str.lower().tolist()
+    texts = text.tolist()
+    ents = entity_text.tolist()
+    
+    # Find entity in text (case-insensitive, then case-sensitive)
+    start_idx = np.fromiter((t.find(e) for t, e in zip(text_l, ent_l)), dtype=np.int64, count=n)
+    retry = np.flatnonzero((start_idx == -1) & ~is_none)
+    for i in retry:
+        start_idx[i] = texts[i].find(ents[i])
+    end_idx = start_idx + entity_text.str.len().to_numpy()
+    
+    # Verify extraction
+    found = ~is_none & (start_idx != -1)
+    verified = np.zeros(n, dtype=bool)
+    for i in np.flatnonzero(found):
+        verified[i] = texts[i][start_idx[i]:end_idx[i]].lower() == ent_l[i]
+    
+    errors = int((~is_none & ~verified).sum())
+    keep = is_none | verified
+    
+    fixed = pd.DataFrame({
+        'text': text[keep].to_numpy(),
+        'entity_text': np.where(is_none, '', entity_text.to_numpy(dtype=object))[keep],
+        'entity_label': np.where(is_none, 'NONE', entity_label.to_numpy(dtype=object))[keep],
+        'start_idx': np.where(is_none, 0, start_idx)[keep],
+        'end_idx': np.where(is_none, 0, end_idx)[keep],
+    })
+    return fixed, errors
+
 
 def auto_fix_indices(csv_file):
     """Auto-fix entity indices while loading."""
     print(f"🔧 Auto-fixing indices...")
-    df = pd.read_csv(csv_file)
-    
-    fixed_rows = []
+    columns = ['text', 'entity_text', 'entity_label']
+    if csv_file.endswith('.parquet'):
+        # Columnar input (ner_augment_dataset.py can write it): no parsing,
+        # just the columns used, fixed in the same chunk sizes
+        df = pd.read_parquet(csv_file, columns=columns)
+        reader = (df.iloc[i:i + CSV_CHUNK_SIZE] for i in range(0, len(df), CSV_CHUNK_SIZE))
+    else:
+        # Stream the CSV so only one raw chunk is resident at a time; only the
+        # columns used, read as strings (indices are recomputed)
+        reader = pd.read_csv(
+            csv_file,
+            usecols=columns,
+            dtype=str,
+            chunksize=CSV_CHUNK_SIZE,
+        )
+    chunks_out = []
     errors = 0
-    
-    for idx, row in df.iterrows():
-        text = str(row['text'])
-        entity_text = str(row['entity_text']).strip()
-        entity_label = row['entity_label']
-        
-        # Skip non-entities
-        if pd.isna(entity_label) or entity_label == 'NONE' or not entity_text or entity_text == 'nan':
-            fixed_rows.append({
-                'text': text,
-                'entity_text': '',
-                'entity_label': 'NONE',
-                'start_idx': 0,
-                'end_idx': 0
-            })
-            continue
-        
-        # Find entity in text (case-insensitive)
-        start_idx = text.lower().find(entity_text.lower())
-        
-        if start_idx == -1:
-            # Try case-sensitive
-            start_idx = text.find(entity_text)
-        
-        if start_idx == -1:
-            errors += 1
-            continue  # Skip if not found
-        
-        end_idx = start_idx + len(entity_text)
-        
-        # Verify extraction
-        extracted = text[start_idx:end_idx]
-        if extracted.lower() != entity_text.lower():
-            errors += 1
-            continue
-        
-        fixed_rows.append({
-            'text': text,
-            'entity_text': entity_text,
-            'entity_label': entity_label,
-            'start_idx': start_idx,
-            'end_idx': end_idx
-        })
+    for chunk in reader:
+        fixed, skipped = _fix_chunk(chunk)
+        chunks_out.append(fixed)
+        errors += skipped
     
     if errors > 0:
         print(f"   ⚠️  Skipped {errors} problematic entities")
     
-    df_fixed = pd.DataFrame(fixed_rows)
+    df_fixed = pd.concat(chunks_out, ignore_index=True)
     
     # Remove duplicate entities (same text + entity + label + indices)
     print(f"🔍 Removing duplicates...")
     original_len = len(df_fixed)
-    df_fixed = df_fixed.drop_duplicates(subset=['text', 'entity_text', 'entity_label', 'start_idx', 'end_idx'])
+    # One 64-bit row hash instead of tuples of five Python objects
+    row_hash = pd.util.hash_pandas_object(
+        df_fixed[['text', 'entity_text', 'entity_label', 'start_idx', 'end_idx']], index=False
+    )
+    df_fixed = df_fixed[~row_hash.duplicated().to_numpy()]
     duplicates_removed = original_len - len(df_fixed)
     if duplicates_removed > 0:
         print(f"   🗑️  Removed {duplicates_removed} duplicate annotations")
     
     # Save fixed dataset
-    fixed_csv_path = csv_file.replace('.csv', '_autofixed.csv')
+    fixed_csv_path = os.path.splitext(csv_file)[0] + '_autofixed.csv'
     df_fixed.to_csv(fixed_csv_path, index=False)
     print(f"💾 Saved fixed dataset to: {fixed_csv_path}")
     
@@ -108,61 +174,26 @@ def load_training_data(csv_file):
     # Auto-fix indices
     df = auto_fix_indices(csv_file)
     
-    # Group by text to get all entities per sentence
-    grouped = df.groupby('text')
-    
-    all_data = []
-    
-    for text, group in grouped:
-        entities = []
-        seen_entities = set()  # Track unique entities per text
+    # Group entities by text in one pass over plain column lists (no
+    # groupby/iterrows row objects). Every text gets an entry, even if it
+    # only has NONE rows; the inner dict dedups (start, end, label) in order.
+    groups = {}
+    for text, start, end, label in zip(df['text'].tolist(), df['start_idx'].tolist(),
+                                       df['end_idx'].tolist(), df['entity_label'].tolist()):
+        entities = groups.setdefault(text, {})
         
-        for _, row in group.iterrows():
-            if pd.isna(row['entity_label']) or row['entity_label'] == 'NONE':
-                continue
-            
-            if pd.isna(row['start_idx']) or pd.isna(row['end_idx']):
-                continue
-                
-            start = int(row['start_idx'])
-            end = int(row['end_idx'])
-            label = row['entity_label']
-            
-            # Create unique key for this entity
-            entity_key = (start, end, label)
-            
-            # Skip if duplicate
-            if entity_key in seen_entities:
-                continue
-            
-            seen_entities.add(entity_key)
-            entities.append((start, end, label))
+        if pd.isna(label) or label == 'NONE':
+            continue
+        if pd.isna(start) or pd.isna(end):
+            continue
         
-        all_data.append((text, {"entities": entities}))
-    
-    # Filter out problematic patterns
-    problematic_patterns = [
-        r'2pm-4pm', r'\d+pm-\d+pm', r'\d+am-\d+am',  # Time ranges
-        r'MonWedFri', r'TueThu', r'monwed',  # Concatenated days
-        r'Wed\.', r'Mon\.', r'Tue\.', r'Thu\.', r'Fri\.', r'Sat\.', r'Sun\.',  # Periods
-    ]
+        entities[(int(start), int(end), label)] = None
     
-    import re
-    filtered_data = []
-    skipped = 0
-    
-    for text, annot in all_data:
-        # Check if text matches any problematic pattern
-        is_bad = False
-        for pattern in problematic_patterns:
-            if re.search(pattern, text):
-                is_bad = True
-                skipped += 1
-                break
-        
-        if not is_bad:
-            filtered_data.append((text, annot))
+    all_data = [(text, {"entities": list(entities)}) for text, entities in groups.items()]
     
+    # Filter out problematic patterns (one precompiled alternation)
+    filtered_data = [(text, annot) for text, annot in all_data if not _BAD_RE.search(text)]
+    skipped = len(all_data) - len(filtered_data)
     all_data = filtered_data
     
     if skipped > 0:
@@ -200,6 +231,14 @@ def train_ner(training_data, n_iter=75):
     print(f"   Examples: {len(training_data)}")
     print(f"   Estimated time: ~{n_iter//10}-{n_iter//5} minutes...")
     
+    # Use the GPU for tok2vec/NER if thinc can (needs cupy); otherwise CPU
+    global _USING_GPU
+    _USING_GPU = spacy.prefer_gpu()
+    if _USING_GPU:
+        print(f"   Device: GPU")
+    else:
+        print(f"   Device: CPU (no GPU/cupy available)")
+    
     # Create blank English model
     nlp = spacy.blank("en")
     
@@ -217,99 +256,165 @@ def train_ner(training_data, n_iter=75):
     other_pipes = [pipe for pipe in nlp.pipe_names if pipe != "ner"]
     
     # Train only NER
+    # Build Examples once; the annotations don't change between iterations.
+    # Texts are tokenized in one streamed tokenizer.pipe pass.
+    docs = nlp.tokenizer.pipe([text for text, _ in training_data], batch_size=1000)
+    examples = [Example.from_dict(doc, annotations)
+                for doc, (_, annotations) in zip(docs, training_data)]
+    
     with nlp.disable_pipes(*other_pipes):
         optimizer = nlp.begin_training()
         
         for iteration in range(n_iter):
-            random.shuffle(training_data)
+            random.shuffle(examples)
             losses = {}
             
             # Batch training data
-            batches = minibatch(training_data, size=compounding(4.0, 32.0, 1.001))
+            batches = minibatch(examples, size=compounding(4.0, 32.0, 1.001))
             
             for batch in batches:
-                examples = []
-                for text, annotations in batch:
-                    doc = nlp.make_doc(text)
-                    example = Example.from_dict(doc, annotations)
-                    examples.append(example)
-                
-                nlp.update(examples, drop=0.35, losses=losses, sgd=optimizer)
+                nlp.update(batch, drop=0.35, losses=losses, sgd=optimizer)
             
             # Print progress
-            if (iteration + 1) % 5 == 0:
-                progress = (iteration + 1) / n_iter * 100
-                bar_length = 30
-                filled = int(bar_length * (iteration + 1) / n_iter)
-                bar = '█' * filled + '░' * (bar_length - filled)
-                print(f"   [{bar}] {progress:5.1f}% - Iteration {iteration + 1:2d}/{n_iter} - Loss: {losses['ner']:6.2f}")
+            done = iteration + 1
+            if done % PROGRESS_EVERY == 0 or done == n_iter:
+                progress = done / n_iter * 100
+                filled = int(BAR_LENGTH * done / n_iter)
+                bar = BAR_FULL[:filled] + BAR_EMPTY[filled:]
+                print(f"   [{bar}] {progress:5.1f}% - Iteration {done:2d}/{n_iter} - Loss: {losses['ner']:6.2f}")
     
     print(f"\n✅ Training complete!")
     return nlp
 
 
+_LABEL_ID = {label: i for i, label in enumerate(ENTITY_LABELS)}
+
+
+def _match_spans(gold, pred, gold_off, pred_off):
+    """Flag gold/pred spans that match exactly within the same document.
+
+    gold/pred: (n, 3) int64 rows of (start, end, label_id), grouped by doc;
+    *_off[d]:*_off[d+1] is doc d's slice. Pure numeric so numba can compile it.
+    """
+    gold_hit = np.zeros(gold.shape[0], dtype=np.bool_)
+    pred_hit = np.zeros(pred.shape[0], dtype=np.bool_)
+    for d in range(gold_off.shape[0] - 1):
+        for i in range(gold_off[d], gold_off[d + 1]):
+            for j in range(pred_off[d], pred_off[d + 1]):
+                if (gold[i, 0] == pred[j, 0] and gold[i, 1] == pred[j, 1]
+                        and gold[i, 2] == pred[j, 2]):
+                    gold_hit[i] = True
+                    pred_hit[j] = True
+    return gold_hit, pred_hit
+
+
+def _pack_spans(spans, off):
+    """One int64 key per span: doc << 40 | start << 24 | end << 8 | label_id."""
+    doc = np.repeat(np.arange(off.shape[0] - 1, dtype=np.int64), np.diff(off))
+    return (doc << 40) | (spans[:, 0] << 24) | (spans[:, 1] << 8) | spans[:, 2]
+
+
+def _packable(spans, off):
+    """True if every field fits its bit range in _pack_spans."""
+    if spans.shape[0] == 0:
+        return True
+    return (off.shape[0] - 1 < 2 ** 23 and spans.min() >= 0
+            and spans[:, :2].max() < 2 ** 16 and spans[:, 2].max() < 2 ** 8)
+
+
+def _match_spans_packed(gold, pred, gold_off, pred_off):
+    """_match_spans via vectorized membership tests on packed span keys.
+
+    Falls back to the plain loop if any offset, label id or doc index is
+    too large to pack without collisions.
+    """
+    if not (_packable(gold, gold_off) and _packable(pred, pred_off)):
+        return _match_spans_loop(gold, pred, gold_off, pred_off)
+    gold_keys = _pack_spans(gold, gold_off)
+    pred_keys = _pack_spans(pred, pred_off)
+    return np.isin(gold_keys, pred_keys), np.isin(pred_keys, gold_keys)
+
+
+_match_spans_loop = _match_spans
+
+if njit is not None:
+    _match_spans = njit(cache=True)(_match_spans)
+else:
+    # no numba: the interpreted loops above would be the slowest path
+    _match_spans = _match_spans_packed
+
+
+def _span_array(rows):
+    return np.array(rows, dtype=np.int64).reshape(-1, 3)
+
+
 def evaluate_model(nlp, test_data):
     """Evaluate model on test set with detailed metrics."""
     
     print(f"\n📊 EVALUATING MODEL ON TEST SET")
     print("="*80)
     
-    # Manual metric calculation
-    metrics = {label: {'tp': 0, 'fp': 0, 'fn': 0} for label in ENTITY_LABELS}
-    metrics['OVERALL'] = {'tp': 0, 'fp': 0, 'fn': 0}
-    
-    errors = []
-    
-    for text, annotations in test_data:
-        # Get predictions
-        pred_doc = nlp(text)
-        
-        # Gold entities
-        gold_ents = set()
-        for start, end, label in annotations["entities"]:
-            gold_ents.add((start, end, label))
+    texts = [text for text, _ in test_data]
+    if _USING_GPU or len(texts) < EVAL_MULTIPROCESS_MIN:
+        n_process = 1
+    else:
+        n_process = os.cpu_count() or 1
+    pred_docs = nlp.pipe(texts, batch_size=EVAL_BATCH_SIZE, n_process=n_process)
+    
+    # Flatten gold/pred spans of all docs into (start, end, label_id) rows
+    gold_rows, pred_rows = [], []
+    gold_off, pred_off = [0], [0]
+    for (text, annotations), pred_doc in zip(test_data, pred_docs):
+        # Gold entities (deduplicated per doc)
+        for start, end, label in dict.fromkeys(annotations["entities"]):
+            gold_rows.append((start, end, _LABEL_ID[label]))
+        gold_off.append(len(gold_rows))
         
         # Predicted entities
-        pred_ents = set()
         for ent in pred_doc.ents:
-            pred_ents.add((ent.start_char, ent.end_char, ent.label_))
-        
-        # Calculate metrics per entity type
-        for start, end, label in gold_ents:
-            if (start, end, label) in pred_ents:
-                # True positive
-                metrics[label]['tp'] += 1
-                metrics['OVERALL']['tp'] += 1
-            else:
-                # False negative (missed)
-                metrics[label]['fn'] += 1
-                metrics['OVERALL']['fn'] += 1
-                
-                if len(errors) < 20:
-                    errors.append({
-                        'type': 'False Negative (Missed)',
-                        'text': text,
-                        'entity': text[start:end],
-                        'label': label,
-                        'start': start,
-                        'end': end
-                    })
-        
-        for start, end, label in pred_ents:
-            if (start, end, label) not in gold_ents:
-                # False positive (wrong prediction)
-                metrics[label]['fp'] += 1
-                metrics['OVERALL']['fp'] += 1
-                
-                if len(errors) < 20:
-                    errors.append({
-                        'type': 'False Positive (Wrong)',
-                        'text': text,
-                        'entity': text[start:end],
-                        'label': label,
-                        'start': start,
-                        'end': end
-                    })
+            pred_rows.append((ent.start_char, ent.end_char, _LABEL_ID[ent.label_]))
+        pred_off.append(len(pred_rows))
+    
+    gold = _span_array(gold_rows)
+    pred = _span_array(pred_rows)
+    gold_off = np.array(gold_off, dtype=np.int64)
+    pred_off = np.array(pred_off, dtype=np.int64)
+    gold_hit, pred_hit = _match_spans(gold, pred, gold_off, pred_off)
+    
+    # Per-label counts
+    n_labels = len(ENTITY_LABELS)
+    tp_counts = np.bincount(gold[gold_hit, 2], minlength=n_labels)
+    fn_counts = np.bincount(gold[~gold_hit, 2], minlength=n_labels)
+    fp_counts = np.bincount(pred[~pred_hit, 2], minlength=n_labels)
+    
+    metrics = {
+        label: {'tp': int(tp_counts[i]), 'fp': int(fp_counts[i]), 'fn': int(fn_counts[i])}
+        for i, label in enumerate(ENTITY_LABELS)
+    }
+    metrics['OVERALL'] = {
+        'tp': int(tp_counts.sum()), 'fp': int(fp_counts.sum()), 'fn': int(fn_counts.sum())
+    }
+    
+    # First 20 errors in document order: a doc's misses, then its wrong predictions
+    misses = np.flatnonzero(~gold_hit)[:20]
+    wrong = np.flatnonzero(~pred_hit)[:20]
+    candidates = sorted(
+        [(np.searchsorted(gold_off, i, side='right') - 1, 0, i) for i in misses] +
+        [(np.searchsorted(pred_off, j, side='right') - 1, 1, j) for j in wrong]
+    )[:20]
+    
+    errors = []
+    for doc_idx, kind, row in candidates:
+        text = texts[doc_idx]
+        start, end, label_id = (gold if kind == 0 else pred)[row].tolist()
+        errors.append({
+            'type': 'False Negative (Missed)' if kind == 0 else 'False Positive (Wrong)',
+            'text': text,
+            'entity': text[start:end],
+            'label': ENTITY_LABELS[label_id],
+            'start': start,
+            'end': end
+        })
     
     # Calculate precision, recall, F1 for each entity type
     print(f"\n📋 DETAILED ACCURACY METRICS")
@@ -4,26 +4,40 @@ Augment dataset by adding lowercase versions of examples
 Creates 70% lowercase, 30% original by adding lowercase copies
 """
 
+import importlib.util
+import os
+
+import numpy as np
 import pandas as pd
 
 INPUT_CSV = "ner_data_fixed_autofixed.csv"
 OUTPUT_CSV = "ner_data_augmented.csv"
+OUTPUT_PARQUET = "ner_data_augmented.parquet"
 
+# Parquet (snappy) is a fraction of the CSV size and loads without parsing;
+# it needs pyarrow or fastparquet. The CSV stays on by default.
+PARQUET_AVAILABLE = any(importlib.util.find_spec(m) for m in ("pyarrow", "fastparquet"))
+WRITE_PARQUET = PARQUET_AVAILABLE
+WRITE_CSV = True
 
-def create_lowercase_version(text, entity_text, start_idx, end_idx, label):
-    """Create lowercase version of a training example."""
-    
-    # Convert to lowercase
-    text_lower = text.lower()
-    entity_lower = text_lower[start_idx:end_idx]
-    
-    return {
-        'text': text_lower,
-        'entity_text': entity_lower,
-        'entity_label': label,
-        'start_idx': start_idx,
-        'end_idx': end_idx
-    }
+# Rows formatted per write when saving the CSV (bounds the text buffer)
+WRITE_CHUNK_ROWS = 10_000
+
+# The columns auto_fix_indices writes; nothing else is read or carried along
+COLUMNS = ['text', 'entity_text', 'entity_label', 'start_idx', 'end_idx']
+
+# Typed up front so read_csv skips inference (labels as category codes,
+# nullable int32 offsets)
+CSV_DTYPES = {
+    'text': 'string',
+    'entity_text': 'string',
+    'entity_label': 'category',
+    'start_idx': 'Int32',
+    'end_idx': 'Int32',
+}
+
+# pyarrow's multithreaded CSV reader when installed, pandas' C parser otherwise
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
 
 
 def augment_with_lowercase(df):
@@ -31,12 +45,8 @@ def augment_with_lowercase(df):
     
     print(f"📊 Original dataset: {len(df)} rows")
     
-    # Keep all original data
-    augmented_rows = df.to_dict('records')
-    
-    # Group by unique text
-    unique_texts = df.groupby('text')
-    original_count = len(unique_texts)
+    # Unique sentences (NaN texts aren't counted, as groupby('text') skipped them)
+    original_count = df['text'].nunique()
     
     print(f"   Unique sentences: {original_count}")
     
@@ -48,51 +58,68 @@ def augment_with_lowercase(df):
     
     lowercase_multiplier = 2.33  # This gives us ~70% lowercase
     
-    lowercase_added = 0
-    
-    for text, group in unique_texts:
-        # Skip if already lowercase
-        if text.islower():
-            continue
-        
-        # Add lowercase versions
-        for _, row in group.iterrows():
-            if pd.isna(row['entity_label']) or row['entity_label'] == 'NONE':
-                augmented_rows.append({
-                    'text': text.lower(),
-                    'entity_text': '',
-                    'entity_label': 'NONE',
-                    'start_idx': 0,
-                    'end_idx': 0
-                })
-                continue
-            
-            start_idx = int(row['start_idx'])
-            end_idx = int(row['end_idx'])
-            
-            lowercase_row = create_lowercase_version(
-                text, 
-                row['entity_text'],
-                start_idx,
-                end_idx,
-                row['entity_label']
-            )
-            
-            # Add 2 copies to reach 70% ratio
-            augmented_rows.append(lowercase_row)
-            augmented_rows.append(lowercase_row.copy())
-            
-            lowercase_added += 2
-    
-    df_augmented = pd.DataFrame(augmented_rows)
-    
-    # Remove exact duplicates
-    df_augmented = df_augmented.drop_duplicates()
+    # A sentence repeats once per entity row; lower()/islower() each distinct
+    # text once and map the results back through its factorize code
+    codes, uniques = pd.factorize(df['text'])
+    uniques = pd.Series(uniques, dtype=object)
+    lower_of = uniques.str.lower().to_numpy(dtype=object)
+    is_lower_of = uniques.str.islower().fillna(True).to_numpy(dtype=bool)
+    is_lower = np.ones(len(df), dtype=bool)  # NaN texts (code -1) are skipped
+    has_text = codes >= 0
+    is_lower[has_text] = is_lower_of[codes[has_text]]
+    
+    # Rows whose text isn't already lowercase, in the order the old per-group
+    # loop visited them (sorted by text, original order within a text).
+    # Only the distinct texts are string-sorted; rows are then stably
+    # ordered by their text's integer rank.
+    rank_of = np.empty(len(uniques), dtype=np.int64)
+    rank_of[np.argsort(uniques.to_numpy(dtype=object), kind='stable')] = np.arange(len(uniques))
+    lc = df.loc[~is_lower, ['entity_label', 'start_idx', 'end_idx']].assign(code=codes[~is_lower])
+    lc = lc.iloc[np.argsort(rank_of[lc['code'].to_numpy()], kind='stable')]
+    
+    is_none = (lc['entity_label'].isna() | (lc['entity_label'] == 'NONE')).to_numpy()
+    text_lower = lower_of[lc['code'].to_numpy()]
+    starts = lc['start_idx'].where(~is_none, 0).astype(np.int32).to_numpy()
+    ends = lc['end_idx'].where(~is_none, 0).astype(np.int32).to_numpy()
+    
+    # Entity text re-sliced from the lowercased sentence; iterate plain
+    # Python lists so each row isn't unboxed from a NumPy scalar. NONE rows
+    # have 0:0 offsets, so they slice to '' without a per-row branch.
+    entity_lower = [
+        t[s:e] for t, s, e in zip(text_lower.tolist(), starts.tolist(), ends.tolist())
+    ]
+    
+    lc_labels = np.where(is_none, 'NONE', lc['entity_label'].to_numpy(dtype=object))
+    if isinstance(df['entity_label'].dtype, pd.CategoricalDtype):
+        # Same categories as the originals, so concat keeps the category dtype
+        lc_labels = pd.Categorical(lc_labels, dtype=df['entity_label'].dtype)
+    
+    lc_rows = pd.DataFrame({
+        'text': text_lower,
+        'entity_text': entity_lower,
+        'entity_label': lc_labels,
+        'start_idx': starts,
+        'end_idx': ends,
+    })
+    
+    # Counted as 2 copies of each entity row (the 70% ratio target); the
+    # second copy is an exact duplicate that the dedup below would remove
+    # anyway, so only one is materialized
+    lowercase_added = 2 * int((~is_none).sum())
+    
+    df_augmented = pd.concat([df, lc_rows], ignore_index=True)
+    
+    # Remove exact duplicates: one 64-bit hash of all columns per row.
+    # entity_text stays in the key: auto_fix matches entities case-insensitively,
+    # so it can differ in case from text[start:end]
+    key = pd.util.hash_pandas_object(df_augmented[COLUMNS], index=False)
+    df_augmented = df_augmented.loc[~key.duplicated().to_numpy()].reset_index(drop=True)
     
     # Calculate distribution
-    texts = df_augmented['text'].unique()
-    lowercase_count = sum(1 for t in texts if t.islower() and t.strip())
-    total_count = len(texts)
+    unique_texts = df_augmented['text'].drop_duplicates()
+    is_lc = unique_texts.str.islower() & (unique_texts.str.strip() != '')
+    lowercase_count = int(is_lc.sum())
+    total_count = len(unique_texts)
     
     actual_ratio = lowercase_count / total_count if total_count > 0 else 0
     
@@ -112,8 +139,20 @@ def main():
     print("\nStrategy: Add lowercase copies to reach 70/30 distribution")
     
     # Load
-    print(f"\n📂 Loading {INPUT_CSV}...")
-    df = pd.read_csv(INPUT_CSV)
+    input_parquet = os.path.splitext(INPUT_CSV)[0] + ".parquet"
+    if PARQUET_AVAILABLE and os.path.exists(input_parquet):
+        print(f"\n📂 Loading {input_parquet}...")
+        df = pd.read_parquet(input_parquet, columns=COLUMNS)
+    else:
+        print(f"\n📂 Loading {INPUT_CSV}...")
+        df = pd.read_csv(INPUT_CSV, usecols=COLUMNS, dtype=CSV_DTYPES, engine=CSV_ENGINE)
+    
+    # Labels as category codes (with NONE, which the lowercase NONE rows
+    # use) so dedup hashes small ints
+    labels = df['entity_label'].astype('category')
+    if 'NONE' not in labels.cat.categories:
+        labels = labels.cat.add_categories(['NONE'])
+    df['entity_label'] = labels
     
     # Augment
     print(f"\n🔄 Adding lowercase versions...")
@@ -121,22 +160,30 @@ def main():
     
     # Show entity statistics
     print(f"\n📊 Entity Statistics:")
-    entity_counts = df_augmented['entity_label'].value_counts()
-    for label, count in entity_counts.items():
-        if label != 'NONE':
-            print(f"   {label:15s}: {count:4d} examples")
+    labels = df_augmented['entity_label']
+    entity_counts = labels[labels != 'NONE'].value_counts()
+    entity_counts = entity_counts[entity_counts > 0]  # categorical keeps unused labels
+    if len(entity_counts):
+        print("\n".join(f"   {label:15s}: {count:4d} examples" for label, count in entity_counts.items()))
     
     # Save
-    print(f"\n💾 Saving to {OUTPUT_CSV}...")
-    df_augmented.to_csv(OUTPUT_CSV, index=False)
+    outputs = []
+    if WRITE_PARQUET:
+        print(f"\n💾 Saving to {OUTPUT_PARQUET}...")
+        df_augmented.to_parquet(OUTPUT_PARQUET, compression='snappy', index=False)
+        outputs.append(OUTPUT_PARQUET)
+    if WRITE_CSV or not outputs:
+        print(f"\n💾 Saving to {OUTPUT_CSV}...")
+        df_augmented.to_csv(OUTPUT_CSV, index=False, chunksize=WRITE_CHUNK_ROWS)
+        outputs.append(OUTPUT_CSV)
     
     print("\n" + "="*80)
     print("✅ DONE!")
     print("="*80)
-    print(f"\nAugmented data: {OUTPUT_CSV}")
+    print(f"\nAugmented data: {', '.join(outputs)}")
     print(f"Total size: {len(df_augmented)} rows (from {len(df)} original)")
     print(f"\nUpdate train_ner_autofix.py:")
-    print(f"  CSV_FILE = '{OUTPUT_CSV}'")
+    print(f"  CSV_FILE = '{outputs[0]}'")
     print(f"\nThen retrain: python train_ner_autofix.py")
 
 